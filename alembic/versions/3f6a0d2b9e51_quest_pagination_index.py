@@ -0,0 +1,36 @@
+"""quest pagination index
+
+Revision ID: 3f6a0d2b9e51
+Revises: e7a4b9c13f20
+Create Date: 2026-10-17 12:20:37.905114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f6a0d2b9e51'
+down_revision: Union[str, None] = 'e7a4b9c13f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keyset pagination compares (created_at, id), NULL timestamps would drop quests from pages
+    op.execute("UPDATE quests SET created_at = now() WHERE created_at IS NULL")
+    op.alter_column('quests', 'created_at',
+               existing_type=sa.DateTime(),
+               existing_server_default=sa.text('now()'),
+               nullable=False)
+    op.create_index('ix_quests_created_at_id', 'quests', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_quests_created_at_id', table_name='quests')
+    op.alter_column('quests', 'created_at',
+               existing_type=sa.DateTime(),
+               existing_server_default=sa.text('now()'),
+               nullable=True)
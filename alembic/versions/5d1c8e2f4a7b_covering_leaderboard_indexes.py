@@ -0,0 +1,45 @@
+"""covering leaderboard indexes
+
+Revision ID: 5d1c8e2f4a7b
+Revises: a9e2309f7b8b
+Create Date: 2026-10-17 09:12:44.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d1c8e2f4a7b'
+down_revision: Union[str, None] = 'a9e2309f7b8b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keyset leaderboard pages read (points, id) ranges plus the displayed columns
+    op.create_index(
+        'ix_users_leaderboard',
+        'users',
+        ['points', 'id'],
+        unique=False,
+        postgresql_include=['telegram_id', 'first_name', 'last_name', 'image_url'],
+    )
+    op.drop_index('ix_users_points_id', table_name='users')
+    op.drop_index('ix_user_points_daily_day', table_name='user_points_daily')
+    op.create_index(
+        'ix_user_points_daily_day',
+        'user_points_daily',
+        ['day'],
+        unique=False,
+        postgresql_include=['user_id', 'points'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_user_points_daily_day', table_name='user_points_daily')
+    op.create_index('ix_user_points_daily_day', 'user_points_daily', ['day'], unique=False)
+    op.create_index('ix_users_points_id', 'users', ['points', 'id'], unique=False)
+    op.drop_index('ix_users_leaderboard', table_name='users')
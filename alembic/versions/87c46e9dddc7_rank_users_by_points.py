@@ -0,0 +1,36 @@
+"""rank users by points
+
+Revision ID: 87c46e9dddc7
+Revises: 0b171f1e3bc1
+Create Date: 2026-10-17 00:32:29.620783
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '87c46e9dddc7'
+down_revision: Union[str, None] = '0b171f1e3bc1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Leaderboard ranking compares (points, id), NULL points would break the ordering
+    op.execute("UPDATE users SET points = 0 WHERE points IS NULL")
+    op.alter_column('users', 'points',
+               existing_type=sa.Integer(),
+               server_default=sa.text('0'),
+               nullable=False)
+    op.create_index('ix_users_points_id', 'users', ['points', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_points_id', table_name='users')
+    op.alter_column('users', 'points',
+               existing_type=sa.Integer(),
+               server_default=None,
+               nullable=True)
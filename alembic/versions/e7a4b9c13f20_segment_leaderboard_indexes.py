@@ -0,0 +1,41 @@
+"""segment leaderboard indexes
+
+Revision ID: e7a4b9c13f20
+Revises: c28cb18d08aa
+Create Date: 2026-10-17 11:05:19.442871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a4b9c13f20'
+down_revision: Union[str, None] = 'c28cb18d08aa'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Class and role leaderboards page through (points, id) within the segment
+    op.create_index(
+        'ix_users_leaderboard_class',
+        'users',
+        ['user_class', 'points', 'id'],
+        unique=False,
+        postgresql_include=['telegram_id', 'first_name', 'last_name', 'image_url'],
+    )
+    op.create_index(
+        'ix_users_leaderboard_role',
+        'users',
+        ['role_id', 'points', 'id'],
+        unique=False,
+        postgresql_include=['telegram_id', 'first_name', 'last_name', 'image_url'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_leaderboard_role', table_name='users')
+    op.drop_index('ix_users_leaderboard_class', table_name='users')
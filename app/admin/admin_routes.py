@@ -19,7 +19,13 @@ from sqlalchemy import select, update
 
 # Local Application Imports
 
-from app.crud import delete_user_by_id, complete_quest_and_take_rewards  # CRUD operations
+from app.crud import (
+    delete_user_by_id,
+    complete_quest_and_take_rewards,
+    record_points_change,
+    points_changed,
+)  # CRUD operations
+from app.catalog import catalog
 from app.database import get_db  # Database session dependency
 from app.models import User as UserModel
 from app.utils.get_current_user import get_current_user
@@ -66,6 +72,14 @@ async def get_user_by_tg_id(user_id: int, db: AsyncSession = Depends(get_db)):
         raise HTTPException(404, "User Not Found")
 
 
+@router.get("/catalog")
+async def get_catalog_stats():
+    """
+    Size, version and hit rate of the in-process quest catalog of this worker.
+    """
+    return catalog.stats()
+
+
 # Endpoint to delete a user by ID
 @router.delete("/users/{user_id}")
 async def delete_user(
@@ -106,6 +120,7 @@ async def update_all_information(
         raise HTTPException(404, "User not found")
 
     new_user_data = await request.json()
+    previous_points = user_info.points
 
     user_info.first_name = new_user_data["first_name"]
     user_info.last_name = new_user_data["last_name"]
@@ -115,7 +130,11 @@ async def update_all_information(
     user_info.points = new_user_data["points"]
     user_info.coins = new_user_data["coins"]
 
+    await record_points_change(
+        db, user_info.id, user_info.points - previous_points, "admin_edit"
+    )
     await db.commit()
+    points_changed(user_info.id, user_info.points)
 
     return {"message": "User information successfully replaced", "user": user_info}
 
@@ -150,11 +169,16 @@ async def update_selected_information(
         "points",
     ]
 
+    previous_points = user_info.points
     for field in available_fields:
         if field in new_user_data:
             setattr(user_info, field, new_user_data[field])
 
+    await record_points_change(
+        db, user_info.id, user_info.points - previous_points, "admin_edit"
+    )
     await db.commit()
+    points_changed(user_info.id, user_info.points)
 
     return {"message": "User information successfully replaced", "user": user_info}
 
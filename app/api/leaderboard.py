@@ -1,32 +1,112 @@
 from fastapi import (
     APIRouter,
     Depends,
-    Request,
+    HTTPException,
+    Query,
 )  # FastAPI components for routing and error handling
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
 )  # SQLAlchemy for asynchronous database operations
+from typing import Optional
+from uuid import UUID
+
 from app.database import get_db
-from app.crud import get_data_leaderboard
-import json
+from app.crud import get_data_leaderboard, get_role_id_by_name, leaderboard_segment
+from app.utils.cursor import decode_cursor
+from app.utils.identity import TelegramIdentity, get_identity
 
 router = APIRouter()  # Create an APIRouter instance for handling routes
 
 
+# Length of each leaderboard period in days, "allTime" ranks lifetime points
+PERIOD_DAYS = {"day": 1, "week": 7, "month": 30, "allTime": None}
+
+# Values accepted by PUT /user/class
+USER_CLASSES = ("frontend", "designer")
+
+
 @router.get("/leaderboard")
-async def get_leaderboard(request: Request, db: AsyncSession = Depends(get_db)):
-    query_params = request.query_params
-    time_type = query_params.get("timeType")
-    time_count = int(query_params.get("timeCount", 1))
+async def get_leaderboard(
+    time_type: str = Query("allTime", alias="timeType"),
+    time_count: int = Query(1, alias="timeCount", ge=1),
+    limit: int = Query(10, ge=1, le=100),
+    around: Optional[int] = Query(None, ge=1, le=50),
+    cursor: Optional[str] = Query(None),
+    user_class: Optional[str] = Query(None, alias="userClass"),
+    role: Optional[str] = Query(None),
+    identity: TelegramIdentity = Depends(get_identity),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Leaderboard of the points earned within a period.
+
+    - **timeType**: `day`, `week`, `month` or `allTime`.
+    - **timeCount**: Number of periods in the window (e.g. 2 weeks).
+    - **limit**: Number of users per page.
+    - **around**: Return the current user with this many users above and below
+      them instead of the top users.
+    - **cursor**: `prevCursor` or `nextCursor` of a previous response, to scroll
+      up or down from it (with the same timeType, timeCount and segment).
+    - **userClass**: Rank only the users of a class (`frontend` or `designer`).
+    - **role**: Rank only the users with this role name.
+
+    Returns a page of users, the current user with their position within the
+    segment (on top and around pages) and the cursors of the neighbouring pages.
+    """
+    if time_type not in PERIOD_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid timeType. Choose one of: {', '.join(PERIOD_DAYS)}.",
+        )
 
-    period = {"day": 1, "week": 7, "month": 30, "allTime": 365}
-    limit = period.get(time_type, 0) * time_count
+    if around is not None and cursor is not None:
+        raise HTTPException(
+            status_code=400, detail="Use either around or cursor, not both."
+        )
 
-    validated_params = request.state.validated_params
-    user_data_str = validated_params.get("user", "")
-    user_data = json.loads(user_data_str) if user_data_str else {}
-    telegram_id = user_data["id"]
+    if user_class is not None and user_class not in USER_CLASSES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid userClass. Choose one of: {', '.join(USER_CLASSES)}.",
+        )
 
-    leaderboard_data = await get_data_leaderboard(telegram_id, limit, db)
+    role_id = None
+    if role is not None:
+        role_id = await get_role_id_by_name(db, role)
+        if role_id is None:
+            raise HTTPException(status_code=400, detail="Invalid role.")
+
+    days = PERIOD_DAYS[time_type]
+    if days is not None:
+        days *= time_count
+
+    leaderboard_data = await get_data_leaderboard(
+        identity.telegram_id,
+        days,
+        limit,
+        db,
+        around=around,
+        cursor=parse_leaderboard_cursor(cursor) if cursor else None,
+        segment=leaderboard_segment(user_class, role_id),
+    )
 
     return leaderboard_data
+
+
+def parse_leaderboard_cursor(cursor: str) -> dict:
+    """
+    Decode a leaderboard cursor into its typed (points, id, position, direction) key.
+    """
+    values = decode_cursor(cursor, "points", "id", "position", "direction")
+    if values["direction"] not in ("next", "prev"):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    try:
+        return {
+            "points": int(values["points"]),
+            "id": UUID(values["id"]),
+            "position": int(values["position"]),
+            "direction": values["direction"],
+        }
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
@@ -4,6 +4,7 @@ from fastapi import (
     APIRouter,
     Depends,
     HTTPException,
+    Query,
     Request,
     Response,
     status,
@@ -13,9 +14,21 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.models import Reward as RewardModel, Quest, UserQuestProgress
 from app.schemas import (
     Quest as QuestSchema,
+    QuestDetail,
     QuestBase,
     QuestsResponse,
+    QuestSearchResponse,
+    QuestBatchRequest,
+    QuestBatchResponse,
     QuestPatchUpdate,
+    QuestProgressItem,
+    QuestProgressMap,
+    ReviewBatchRequest,
+    ReviewBatchResponse,
+    ReviewResult,
+    ReviewQueueItem,
+    ReviewQueueResponse,
+    ReviewQueueUser,
     RewardBase as RewardBaseSchema,
     InitialQuestResponse,
     QuestCreateResponse,
@@ -27,28 +40,43 @@ from app.schemas import (
 from app.crud import (
     create_quest,
     get_quests,
+    get_quest_total,
+    get_quest,
+    get_quest_detail,
+    get_quests_progress,
+    search_quests,
+    get_review_queue,
     get_quest_by_id,
     get_reward_by_quest_id,
     create_reward,
     delete_reward_by_id,
-    create_quest,
-    get_quests,
-    get_quest_by_id,
     update_quest_fields_in_db,
     update_quest_in_db,
     delete_quest_in_db,
 )
+from app.api.leaderboard import USER_CLASSES
+from app.catalog import catalog
 from app.database import get_db
+from app.quest_transitions import (
+    review_quest_progress,
+    start_quest,
+    transition_quest_progress,
+)
 from uuid import UUID
 from app.utils.get_current_user import get_current_user
 from app.utils.get_user_id import get_user_id
+from app.utils.cursor import decode_cursor, encode_cursor
+from app.utils.etag import check_etag, make_etag
 from datetime import datetime, timezone
-from typing import Dict, List
+from typing import Dict, List, Optional, Union
 
 
 from app.utils.role_check import role_required
 from app.crud import get_initial_quest
 
+# Roles allowed to list and review submissions
+REVIEWER_ROLES = ["admin", "kingdom"]
+
 # Create an APIRouter instance for quest-related routes
 
 router = APIRouter()
@@ -58,14 +86,19 @@ router = APIRouter()
     "/quests/initial-quest",
     response_model=QuestSchema,  # Specify the response model
 )
-async def read_initial_quest(db: AsyncSession = Depends(get_db)):
+async def read_initial_quest(
+    request: Request, response: Response, db: AsyncSession = Depends(get_db)
+):
     """
     Fetch the initial quest for new users asynchronously.
 
     This endpoint retrieves the initial quest that new users must complete.
-    If the quest is not found, it raises a 404 HTTP exception.
+    If the quest is not found, it raises a 404 HTTP exception. A request whose
+    If-None-Match holds the current ETag gets 304 Not Modified.
 
     Args:
+        request (Request): The incoming request, for If-None-Match.
+        response (Response): The outgoing response, for the ETag header.
         db (AsyncSession, optional): The database session injected via
         dependency injection.
 
@@ -75,6 +108,15 @@ async def read_initial_quest(db: AsyncSession = Depends(get_db)):
     Returns:
         Quest: The initial quest object to be returned in the response.
     """
+    # With the catalog loaded the ETag is known before anything is read
+    version = catalog.serving_version()
+    if version is not None:
+        not_modified = check_etag(
+            request, response, make_etag("initial-quest", version)
+        )
+        if not_modified:
+            return not_modified
+
     # Await the asynchronous function to fetch the initial quest
     quest = await get_initial_quest(db)
 
@@ -82,6 +124,13 @@ async def read_initial_quest(db: AsyncSession = Depends(get_db)):
         # Raise a 404 error if the initial quest is not found
         raise HTTPException(status_code=404, detail="Initial quest not found")
 
+    if version is None:
+        not_modified = check_etag(
+            request, response, make_etag("initial-quest", quest.id, quest.updated_at)
+        )
+        if not_modified:
+            return not_modified
+
     return quest
 
 
@@ -104,28 +153,250 @@ async def create_new_quest(quest: QuestBase, db: AsyncSession = Depends(get_db))
 # Endpoint to retrieve a list of quests with optional pagination
 @router.get("/quests", response_model=QuestsResponse)
 async def read_quests(
-    db: AsyncSession = Depends(get_db), skip: int = 0, limit: int = 10
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    skip: int = 0,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    include_total: bool = Query(True, alias="includeTotal"),
+    estimate_total: bool = Query(False, alias="estimateTotal"),
 ):
     """
-    Retrieve a list of quests from the database.
+    Retrieve a list of quests from the database, ordered by creation time.
 
     - **db**: Database session dependency, automatically provided by FastAPI.
-    - **skip**: Number of quests to skip (for pagination).
+    - **skip**: Number of quests to skip (offset pagination, kept for compatibility).
     - **limit**: Maximum number of quests to return.
+    - **cursor**: `nextCursor` of the previous page; takes precedence over `skip`.
+    - **includeTotal**: Set to false to skip the total count (`total` is null).
+    - **estimateTotal**: Allow an estimated total from table statistics when the
+      exact count is not cached (`totalEstimated` tells which one was returned).
 
-    Returns a JSON object with a list of quests under the 'quests' key in camelCase format.
+    Returns a JSON object with a list of quests under the 'quests' key in camelCase format,
+    the total count and the cursor of the next page.
     The quests are returned as a list of `QuestBase` objects.
+    Responses carry an ETag; a matching If-None-Match gets 304 Not Modified.
     """
-    # Fetch quests from the database along with the total count for pagination
-    quests, total_count = await get_quests(db, skip, limit)
+    after = parse_quest_cursor(cursor) if cursor else None
+
+    # With the catalog loaded the ETag is known before anything is read
+    version = catalog.serving_version()
+    if version is not None:
+        not_modified = check_etag(request, response, make_etag("quests", version))
+        if not_modified:
+            return not_modified
+
+    # Fetch a page of quests and, unless skipped, the (usually cached) total count
+    quests, next_key = await get_quests(db, skip, limit, after)
+    total_count, total_estimated = (
+        await get_quest_total(db, estimate_total) if include_total else (None, False)
+    )
+
+    if version is None:
+        not_modified = check_etag(
+            request,
+            response,
+            make_etag(
+                "quests",
+                [(quest.id, quest.updated_at) for quest in quests],
+                total_count,
+                total_estimated,
+                next_key,
+            ),
+        )
+        if not_modified:
+            return not_modified
+
     # Return a response model containing the list of quests and the total count
     return QuestsResponse(
         message="List of quests fetched from the database.",
         quests=quests,
         total=total_count,
+        total_estimated=total_estimated,
+        next_cursor=(
+            encode_cursor({"createdAt": next_key[0].isoformat(), "id": next_key[1]})
+            if next_key
+            else None
+        ),
+    )
+
+
+# Declared before /quests/{quest_id}, which would otherwise capture "search"
+@router.get("/quests/search", response_model=QuestSearchResponse)
+async def search_quest_catalog(
+    request: Request,
+    response: Response,
+    q: Optional[str] = Query(None, max_length=200),
+    quest_types: Optional[List[str]] = Query(None, alias="type"),
+    min_level: Optional[int] = Query(None, alias="minLevel", ge=0),
+    max_level: Optional[int] = Query(None, alias="maxLevel", ge=0),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=50),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Search quests by words of their name, type and descriptions.
+
+    - **q**: Search words (Ukrainian or English); each must match the start of a
+      word of the quest, so inflected forms match as well. Empty matches all quests.
+    - **type**: Only quests of this type; may be repeated.
+    - **minLevel** / **maxLevel**: Only quests whose required level is in the range.
+    - **skip** / **limit**: Page of the ranked results.
+
+    Returns the quests ranked by relevance, the number of matches and the facet
+    counts per type and requiredLevel range.
+    Responses carry an ETag; a matching If-None-Match gets 304 Not Modified.
+    """
+    # With the catalog loaded the ETag is known before anything is read
+    version = catalog.serving_version()
+    if version is not None:
+        not_modified = check_etag(request, response, make_etag("search", version))
+        if not_modified:
+            return not_modified
+
+    quests, total, facets = await search_quests(
+        db, q, quest_types, min_level, max_level, skip, limit
+    )
+    return QuestSearchResponse(
+        message="Quests matching the search.",
+        quests=quests,
+        total=total,
+        facets=facets,
+    )
+
+
+@router.post("/quests/batch", response_model=QuestBatchResponse)
+async def read_quest_batch(body: QuestBatchRequest, db: AsyncSession = Depends(get_db)):
+    """
+    Retrieve up to 500 quests by ID in one request.
+
+    - **ids**: The quest IDs, e.g. the keys of `GET /quests/quests_progress`.
+
+    Returns the quests in the requested order (repeated ids once) and the ids
+    that match no quest. Served from the quest catalog, or with a single
+    `id = ANY(...)` query while it is not loaded.
+    """
+    requested = list(dict.fromkeys(body.ids))
+    found = await catalog.get_quests(db, requested)
+    return QuestBatchResponse(
+        message="Quests fetched by ID.",
+        quests=[found[quest_id] for quest_id in requested if quest_id in found],
+        missing=[quest_id for quest_id in requested if quest_id not in found],
+    )
+
+
+@router.post("/quests/review", response_model=ReviewBatchResponse)
+@role_required(REVIEWER_ROLES)
+async def review_quests(
+    request: Request, body: ReviewBatchRequest, db: AsyncSession = Depends(get_db)
+):
+    """
+    Complete or request changes on up to 500 submissions in one request.
+
+    - **decisions**: Progress row id (as listed by `GET /quests/review_queue`),
+      `complete` or `request_changes`, and an optional mentor comment.
+
+    All decisions are applied with a single UPDATE. Submissions that are no
+    longer waiting for review are skipped (`applied: false`) without failing
+    the others. Reviewers only.
+    """
+    updated = await review_quest_progress(
+        db,
+        (
+            (decision.id, decision.action, decision.mentor_comment)
+            for decision in body.decisions
+        ),
+    )
+    requested = list(dict.fromkeys(decision.id for decision in body.decisions))
+    return ReviewBatchResponse(
+        message="Review decisions applied.",
+        results=[
+            ReviewResult(
+                id=progress_id,
+                applied=progress_id in updated,
+                progress=(
+                    UserQuestProgressResponse.model_validate(updated[progress_id])
+                    if progress_id in updated
+                    else None
+                ),
+            )
+            for progress_id in requested
+        ],
+        applied=len(updated),
+        skipped=len(requested) - len(updated),
+    )
+
+
+@router.get("/quests/review_queue", response_model=ReviewQueueResponse)
+@role_required(REVIEWER_ROLES)
+async def read_review_queue(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=100),
+    quest_id: Optional[UUID] = Query(None, alias="questId"),
+    user_class: Optional[str] = Query(None, alias="userClass"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Submissions waiting for mentor review, oldest submission first.
+
+    - **cursor**: `nextCursor` of the previous page.
+    - **limit**: Maximum number of submissions to return (up to 100).
+    - **questId**: Only submissions of this quest.
+    - **userClass**: Only submissions of users of this class.
+
+    Returns the submissions, the users and quests they reference (each listed
+    once, keyed by id) and the cursor of the next page. Reviewers only.
+    """
+    if user_class is not None and user_class not in USER_CLASSES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid userClass. Choose one of: {', '.join(USER_CLASSES)}.",
+        )
+
+    after = parse_review_cursor(cursor) if cursor else None
+    items, users, quests, next_key = await get_review_queue(
+        db, limit, after, quest_id, user_class
+    )
+    return ReviewQueueResponse(
+        message="Submissions waiting for review.",
+        items=[ReviewQueueItem.model_validate(item) for item in items],
+        users={
+            user_id: ReviewQueueUser.model_validate(user)
+            for user_id, user in users.items()
+        },
+        quests=quests,
+        next_cursor=(
+            encode_cursor({"submittedAt": next_key[0].isoformat(), "id": next_key[1]})
+            if next_key
+            else None
+        ),
     )
 
 
+def parse_quest_cursor(cursor: str) -> tuple:
+    """
+    Decode a quests cursor into its (created_at, id) key.
+    """
+    values = decode_cursor(cursor, "createdAt", "id")
+    try:
+        return datetime.fromisoformat(values["createdAt"]), UUID(values["id"])
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def parse_review_cursor(cursor: str) -> tuple:
+    """
+    Decode a review queue cursor into its (submitted_at, id) key.
+    """
+    values = decode_cursor(cursor, "submittedAt", "id")
+    try:
+        return datetime.fromisoformat(values["submittedAt"]), UUID(values["id"])
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 # @router.get("/quests/progress", response_model=Dict[str, UserQuestProgressResponse])
 # async def get_user_quests(db: AsyncSession = Depends(get_db)):
 #     result = await db.execute(select(UserQuestProgress))
@@ -154,57 +425,103 @@ async def read_quests(
 #     return user_quest_dict
 
 
-# @router.get("/quests/quests_progress")
-@router.get(
-    "/quests/quests_progress",
-)
-async def accept_quest(
-    user_id: User = Depends(get_user_id),
+@router.get("/quests/quests_progress", response_model=Dict[UUID, QuestProgressItem])
+async def read_quests_progress(
+    since: Optional[datetime] = None,
+    user_id: UUID = Depends(get_user_id),
     db: AsyncSession = Depends(get_db),
 ):
-    # Check if the quest exists
-    result = await db.execute(
-        select(UserQuestProgress).where(UserQuestProgress.user_id == user_id)
-    )
-    quests_progress = result.scalars().all()
+    """
+    The caller's progress on each quest, keyed by quest ID.
 
-    if not quests_progress:
+    - **since**: Only progress created or changed after this time, e.g. the
+      largest `updated_at` of the previous response; nothing changed returns `{}`.
+
+    Only the columns of `QuestProgressItem` are read, and the rows are
+    serialized by a pre-built adapter instead of per-request inference.
+    """
+    if since is not None and since.tzinfo is not None:
+        # Timestamps are stored as naive UTC
+        since = since.astimezone(timezone.utc).replace(tzinfo=None)
+
+    quests_progress = await get_quests_progress(db, user_id, since)
+
+    if not quests_progress and since is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Quests progress not found"
         )
 
-    # Create a dictionary where id is the key and UserQuestProgressResponse is the value
-    mapped_data = {quest.quest_id: quest for quest in quests_progress}
-
-    return mapped_data
+    return Response(
+        content=QuestProgressMap.dump_json(
+            QuestProgressMap.validate_python(quests_progress, from_attributes=True)
+        ),
+        media_type="application/json",
+    )
 
 
-@router.get("/quests/{quest_id}", response_model=QuestSchema)
+@router.get("/quests/{quest_id}", response_model=Union[QuestDetail, QuestSchema])
 async def read_quest(
     quest_id: UUID,  # The ID of the quest to retrieve
+    request: Request,
+    response: Response,
+    expand: bool = False,
     db: AsyncSession = Depends(get_db),  # Dependency injection for the database session
 ):
     """
     Retrieve a single quest by its ID from the database.
 
     - **quest_id**: The ID of the quest to retrieve.
+    - **expand**: Also return the quest's `rewards`, its `requirementItems` and the
+      current user's `progress` on it (null if not accepted), so the quest
+      screen needs a single request.
     - **db**: Database session dependency, automatically provided by FastAPI.
 
     Returns a JSON object representing the quest. If the quest is not found, raises a 404 error.
+    Plain responses carry an ETag; a matching If-None-Match gets 304 Not Modified.
     """
-    # Fetch the quest from the database using the provided quest_id
-    quest = await get_quest_by_id(db, quest_id)
+    if expand:
+        # The progress part is per user, so expanded responses are not cached
+        quest_detail = await get_quest_detail(
+            db, quest_id, await get_user_id(request, db)
+        )
+        if quest_detail is None:
+            raise HTTPException(status_code=404, detail="Quest not found")
+        return quest_detail
+
+    # With the catalog loaded the ETag is known before anything is read
+    version = catalog.serving_version()
+    if version is not None:
+        not_modified = check_etag(
+            request, response, make_etag("quest", quest_id, version)
+        )
+        if not_modified:
+            return not_modified
+
+    # Fetch the quest from the catalog (or the database) using the provided quest_id
+    quest = await get_quest(db, quest_id)
 
     # Check if the quest was found; if not, raise a 404 error
     if quest is None:
         raise HTTPException(status_code=404, detail="Quest not found")
 
+    if version is None:
+        not_modified = check_etag(
+            request, response, make_etag("quest", quest.id, quest.updated_at)
+        )
+        if not_modified:
+            return not_modified
+
     # Return the retrieved quest as a QuestSchema
     return quest
 
 
 @router.get("/quests/{quest_id}/rewards")
-async def get_quest_rewards(quest_id: UUID, db: AsyncSession = Depends(get_db)):
+async def get_quest_rewards(
+    quest_id: UUID,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+):
     """
     Retrieve a rewards by quest ID from the database.
 
@@ -212,13 +529,31 @@ async def get_quest_rewards(quest_id: UUID, db: AsyncSession = Depends(get_db)):
     - **db**: Database session dependency, automatically provided by FastAPI.
 
     Returns a JSON object representing the quest. If the quest is not found, raises a 404 error.
+    Responses carry an ETag; a matching If-None-Match gets 304 Not Modified.
     """
+    # With the catalog loaded the ETag is known before anything is read
+    version = catalog.serving_version()
+    if version is not None:
+        not_modified = check_etag(
+            request, response, make_etag("rewards", quest_id, version)
+        )
+        if not_modified:
+            return not_modified
 
     reward = await get_reward_by_quest_id(quest_id, db)
 
     if reward is None:
         raise HTTPException(status_code=404, detail="Rewards not found")
 
+    if version is None:
+        not_modified = check_etag(
+            request,
+            response,
+            make_etag("rewards", [(item.id, item.updated_at) for item in reward]),
+        )
+        if not_modified:
+            return not_modified
+
     return reward
 
 
@@ -268,7 +603,10 @@ async def patch_the_reward(
         if field in new_request_data:
             setattr(reward, field, new_request_data[field])
 
+    version = await catalog.bump_version(db)
     await db.commit()
+    await db.refresh(reward)
+    await catalog.reward_saved(db, version, reward)
 
     return {"message": "Reward  information successfully updated", "reward": reward}
 
@@ -375,42 +713,12 @@ async def accept_quest(
     user_id: User = Depends(get_user_id),
     db: AsyncSession = Depends(get_db),
 ):
-    # Check if the quest exists
-    result = await db.execute(select(Quest).filter(Quest.id == quest_id))
-    quest = result.scalar_one_or_none()
-    if not quest:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Quest not found"
-        )
-
-    # Check if the user has already accepted this quest
-    result = await db.execute(
-        select(UserQuestProgress).filter(
-            UserQuestProgress.user_id == user_id,
-            UserQuestProgress.quest_id == quest_id,
-        )
-    )
-    existing_progress = result.scalar_one_or_none()
-
-    if existing_progress:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="User has already accepted this quest",
-        )
+    # Insert the progress row if the quest exists and was not accepted yet
+    return await start_quest(db, user_id, quest_id)
 
-    # Create a new UserQuestProgress record
-    new_progress = UserQuestProgress(
-        user_id=user_id,
-        quest_id=quest_id,
-        status="IN_PROGRESS",  # Set initial quest status
-    )
-
-    # Add and commit the new progress
-    db.add(new_progress)
-    await db.commit()
-    await db.refresh(new_progress)
 
-    return new_progress
+# The moves below are declared in QUEST_TRANSITIONS; each one is a single
+# conditional UPDATE ... RETURNING on the user's progress row
 
 
 # Endpoint 2: Submit a Quest for Review
@@ -422,36 +730,8 @@ async def submit_quest(
     ),  # Uses get_user_id to retrieve only the user's ID
     db: AsyncSession = Depends(get_db),
 ):
-    # Check if the quest progress record exists for the user
-    result = await db.execute(
-        select(UserQuestProgress).filter(
-            UserQuestProgress.user_id == user_id, UserQuestProgress.quest_id == quest_id
-        )
-    )
-    quest_progress = result.scalars().first()
-
-    # If no progress record, return an error
-    if not quest_progress:
-        raise HTTPException(
-            status_code=404, detail="Quest progress not found for this user"
-        )
-
-    # Check if the quest is already in review or completed
-    if quest_progress.status in ["REVIEW_PENDING", "TASK_COMPLETED"]:
-        raise HTTPException(
-            status_code=400,
-            detail="Quest is already submitted for review or completed",
-        )
-
-    # Update quest status to "REVIEW_PENDING"
-    quest_progress.status = "REVIEW_PENDING"
-    # quest_progress.updated_at = datetime.now(timezone.utc)
-
-    db.add(quest_progress)
-    await db.commit()
-    await db.refresh(quest_progress)
-
-    return quest_progress
+    # Update quest status to "REVIEW_PENDING" unless it is already in review or completed
+    return await transition_quest_progress(db, user_id, quest_id, "submit")
 
 
 @router.post(
@@ -463,28 +743,13 @@ async def request_changes(
     user_id: UUID = Depends(get_user_id),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(
-        select(UserQuestProgress).filter(
-            UserQuestProgress.user_id == user_id, UserQuestProgress.quest_id == quest_id
-        )
+    return await transition_quest_progress(
+        db,
+        user_id,
+        quest_id,
+        "request_changes",
+        mentor_comment=mentor_comment.mentor_comment,
     )
-    quest_progress = result.scalars().first()
-
-    if not quest_progress or quest_progress.status != "REVIEW_PENDING":
-        raise HTTPException(
-            status_code=400,
-            detail="Quest is not in a reviewable state for requesting changes",
-        )
-
-    quest_progress.status = "CHANGES_REQUESTED"
-    quest_progress.mentor_comment = mentor_comment.mentor_comment
-    # quest_progress.updated_at = datetime.now(timezone.utc)
-
-    db.add(quest_progress)
-    await db.commit()
-    await db.refresh(quest_progress)
-
-    return quest_progress
 
 
 @router.post("/quests/{quest_id}/complete", response_model=UserQuestProgressResponse)
@@ -493,27 +758,7 @@ async def complete_quest(
     user_id: UUID = Depends(get_user_id),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(
-        select(UserQuestProgress).filter(
-            UserQuestProgress.user_id == user_id, UserQuestProgress.quest_id == quest_id
-        )
-    )
-    quest_progress = result.scalars().first()
-
-    if not quest_progress or quest_progress.status != "REVIEW_PENDING":
-        raise HTTPException(
-            status_code=400,
-            detail="Quest is not in a reviewable state for completion",
-        )
-
-    quest_progress.status = "TASK_COMPLETED"
-    # quest_progress.completed_at = datetime.now(timezone.utc)
-
-    db.add(quest_progress)
-    await db.commit()
-    await db.refresh(quest_progress)
-
-    return quest_progress
+    return await transition_quest_progress(db, user_id, quest_id, "complete")
 
 
 @router.post(
@@ -524,24 +769,4 @@ async def complete_quest(
     user_id: UUID = Depends(get_user_id),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(
-        select(UserQuestProgress).filter(
-            UserQuestProgress.user_id == user_id, UserQuestProgress.quest_id == quest_id
-        )
-    )
-    quest_progress = result.scalars().first()
-
-    if not quest_progress or quest_progress.status != "TASK_COMPLETED":
-        raise HTTPException(
-            status_code=400,
-            detail="Quest is not in a accept reward state",
-        )
-
-    quest_progress.is_reward_accepted = True
-    # quest_progress.completed_at = datetime.now(timezone.utc)
-
-    db.add(quest_progress)
-    await db.commit()
-    await db.refresh(quest_progress)
-
-    return quest_progress
+    return await transition_quest_progress(db, user_id, quest_id, "accept_reward")
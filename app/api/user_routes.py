@@ -1,6 +1,5 @@
 # Standard Library Imports
-import json  # For JSON parsing
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
 # Third-Party Imports
@@ -8,7 +7,9 @@ from fastapi import (
     APIRouter,
     HTTPException,
     Depends,
+    Query,
     Request,
+    Response,
     status,
 )  # FastAPI components for routing and error handling
 
@@ -28,6 +29,7 @@ from app.schemas import (
     UpdateUserClassRequest,
     User,
     UpdateUserProfileDetailsRequest,
+    NormalizedUserResponse,
 )  # User data validation schema
 from app.crud import (
     get_user_by_tID,
@@ -35,10 +37,13 @@ from app.crud import (
     delete_user_by_id,
     assign_initial_quests,
     assign_initial_achievements,
+    record_points_change,
+    points_changed,
 )  # CRUD operations
 from app.database import get_db  # Database session dependency
 from app.models import UserRoleModel, User as UserModel
 from app.utils.get_current_user import get_current_user
+from app.utils.identity import get_identity
 
 from app.utils.role_check import role_required
 
@@ -75,12 +80,17 @@ async def update_selected_information(
     except NoResultFound:
         raise HTTPException(status_code=404, detail="User not found")
 
+    previous_points = user_info.points
     for field, value in new_user_data.dict(exclude_unset=True).items():
         setattr(user_info, field, value)
 
+    await record_points_change(
+        db, user_info.id, user_info.points - previous_points, "profile_edit"
+    )
     db.add(user_info)
     await db.commit()
     await db.refresh(user_info)
+    points_changed(user_info.id, user_info.points)
 
     return {"message": "User information updated successfully", "user": user_info}
 
@@ -115,14 +125,48 @@ async def update_user_class(
     return {"message": "User was updated successfully", "user": updated_user}
 
 
+# Media type selecting the normalized profile shape through the Accept header
+NORMALIZED_PROFILE_MEDIA_TYPE = "application/vnd.itacademy.normalized+json"
+
+# OpenAPI schema of the normalized profile; the models it references are already
+# component schemas through UserResponse
+NORMALIZED_PROFILE_SCHEMA = {
+    key: value
+    for key, value in NormalizedUserResponse.model_json_schema(
+        ref_template="#/components/schemas/{model}", mode="serialization"
+    ).items()
+    if key != "$defs"
+}
+
+
 # Endpoint to verify initial data and handle user authentication
-@router.get("/user", response_model=UserResponse)
-async def get_user_data(request: Request, db: AsyncSession = Depends(get_db)):
+@router.get(
+    "/user",
+    response_model=UserResponse,
+    responses={
+        200: {
+            "content": {
+                NORMALIZED_PROFILE_MEDIA_TYPE: {"schema": NORMALIZED_PROFILE_SCHEMA}
+            }
+        }
+    },
+)
+async def get_user_data(
+    request: Request,
+    response: Response,
+    shape: Optional[str] = Query(
+        None, description="'normalized' to reference quests/achievements by id"
+    ),
+    db: AsyncSession = Depends(get_db),
+):
     """
     Fetches user data from the database based on the Telegram ID.
     Raises an exception if the user does not exist and prompts role selection.
 
     - **request**: The HTTP request object containing validated params.
+    - **shape**: `normalized` returns progress and achievements referencing ids, with
+      the quests and achievements listed once in `quests`/`achievements` dictionaries.
+      The same shape is selected by `Accept: application/vnd.itacademy.normalized+json`.
     - **db**: AsyncSession for performing database operations.
 
     Returns a dictionary containing the message and the user data if found.
@@ -131,19 +175,38 @@ async def get_user_data(request: Request, db: AsyncSession = Depends(get_db)):
 
     # Use the get_current_user function to retrieve the user
     current_user = await get_current_user(request, db)
-    if current_user:
-        # If the user exists, return a success message along with their data
-        return {
-            "message": "User data fetched from the database",
-            "user": current_user,
-        }
-    else:
+    if not current_user:
         # If no user is found, raise an HTTP 401 error and request role selection
         raise HTTPException(
             status_code=401,
             detail="Please choose a role to complete your registration.",
         )
 
+    message = "User data fetched from the database"
+
+    accept = request.headers.get("Accept", "")
+    vendor_type_requested = NORMALIZED_PROFILE_MEDIA_TYPE in accept
+    if shape == "normalized" or vendor_type_requested:
+        normalized = NormalizedUserResponse.from_user(current_user, message)
+        return Response(
+            content=normalized.to_json(),
+            media_type=(
+                NORMALIZED_PROFILE_MEDIA_TYPE
+                if vendor_type_requested
+                else "application/json"
+            ),
+            headers={"Vary": "Accept"},
+        )
+
+    # The nested shape is only the default for this Accept header
+    response.headers["Vary"] = "Accept"
+
+    # If the user exists, return a success message along with their data
+    return {
+        "message": message,
+        "user": current_user,
+    }
+
 
 @router.post("/user", response_model=UserResponse)
 async def create_user_after_role_selection(
@@ -162,13 +225,16 @@ async def create_user_after_role_selection(
     if not role:
         raise HTTPException(status_code=400, detail="Invalid role selected")
 
-    # Retrieve validated params from the request state
-    validated_params = request.state.validated_params
-    user_data_str = validated_params.get("user", "")
-    user_data = json.loads(user_data_str) if user_data_str else {}
+    # Retrieve the Telegram identity decoded by the auth layer
+    identity = get_identity(request)
 
-    user_data["telegram_id"] = user_data.pop("id")
-    user_data["role_id"] = role.id  # Assign the role ID to user_data
+    user_data = {
+        "telegram_id": identity.telegram_id,
+        "first_name": identity.first_name,
+        "last_name": identity.last_name,
+        "username": identity.username,
+        "role_id": role.id,  # Assign the role ID to user_data
+    }
 
     existing_user = await get_user_by_tID(db, user_data.get("telegram_id"))
     if existing_user:
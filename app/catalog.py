@@ -0,0 +1,347 @@
+import asyncio
+import os
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import any_, bindparam, select
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import (
+    Achievement as AchievementModel,
+    CatalogState,
+    InitialQuest,
+    Quest as QuestModel,
+    Requirement as RequirementModel,
+    Reward as RewardModel,
+)
+from app.quest_search import QuestSearchIndex, facet_counts, matches_levels
+from app.schemas import (
+    Achievement as AchievementSchema,
+    Quest as QuestSchema,
+    Requirement as RequirementSchema,
+    Reward as RewardSchema,
+)
+from app.utils.cache import LRUCache
+
+# Row of catalog_state holding the version
+CATALOG_STATE_ID = 1
+
+
+class Catalog:
+    """
+    Shared in-process catalog of quest and achievement details.
+
+    Profile loads only fetch progress/achievement rows and take the quest and
+    achievement details from here, so the long quest texts are transferred once
+    per process instead of once per progress row.
+
+    Once loaded, the catalog also holds every quest with its rewards and
+    requirements and the initial quest, so quest reads need no database round
+    trip. Quest and reward writes bump `catalog_state.version` in their
+    transaction and patch the catalog after committing; a worker that missed a
+    version (written by another worker) rebuilds instead, and
+    `reconcile_forever` polls the version so idle workers catch up as well.
+    Writes made outside the crud functions are picked up once the version is
+    bumped.
+
+    Args:
+        maxsize (int): Maximum number of cached quests and achievements (each)
+                       while the full catalog is not loaded.
+        ttl (float): Seconds such an entry is trusted; bounds staleness across workers.
+        enabled (bool): Load and serve the full quest catalog.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 300, enabled: bool = True):
+        self.quests = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.achievements = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.enabled = enabled
+        self.ready = False  # Becomes True after the first full load
+        self.version = None  # catalog_state.version the content corresponds to
+        self.hits = 0  # Reads served from memory
+        self.misses = 0  # Reads that went to the database
+        self._quests: Dict[UUID, QuestSchema] = {}
+        self._keys: List[Tuple] = []  # (created_at, id) of every quest, sorted
+        self._rewards: Dict[UUID, List[RewardSchema]] = {}
+        self._requirements: Dict[UUID, List[RequirementSchema]] = {}
+        self._initial_quest_id: Optional[UUID] = None
+        self._search_index = QuestSearchIndex()
+
+    # Reads
+
+    def serving(self) -> bool:
+        """Whether the next read is answered from memory; counts hits and misses."""
+        if self.enabled and self.ready:
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def serving_version(self) -> Optional[int]:
+        """Version of the content served from memory, None while reads use the database."""
+        return self.version if self.enabled and self.ready else None
+
+    def quest(self, quest_id: UUID) -> Optional[QuestSchema]:
+        return self._quests.get(quest_id)
+
+    def page(
+        self, skip: int = 0, limit: int = 10, after: Optional[tuple] = None
+    ) -> Tuple[List[QuestSchema], Optional[tuple]]:
+        """Same page as `crud.get_quests`: quests ordered by (created_at, id)."""
+        start = bisect_right(self._keys, after) if after is not None else skip
+        keys = self._keys[start : start + limit]
+        next_key = keys[-1] if keys and start + limit < len(self._keys) else None
+        return [self._quests[key[1]] for key in keys], next_key
+
+    def total(self) -> int:
+        return len(self._quests)
+
+    def rewards(self, quest_id: UUID) -> List[RewardSchema]:
+        return self._rewards.get(quest_id, [])
+
+    def requirements(self, quest_id: UUID) -> List[RequirementSchema]:
+        return self._requirements.get(quest_id, [])
+
+    def initial_quest(self) -> Optional[QuestSchema]:
+        return self._quests.get(self._initial_quest_id)
+
+    def search(
+        self,
+        terms: List[str],
+        types: Optional[List[str]],
+        min_level: Optional[int],
+        max_level: Optional[int],
+        skip: int,
+        limit: int,
+    ) -> Tuple[List[QuestSchema], int, dict]:
+        """Same results as `crud.search_quests`, from the in-memory search index."""
+        if terms:
+            scores = self._search_index.search(terms)
+            matches = [self._quests[quest_id] for quest_id in scores]
+        else:
+            scores = {}
+            matches = list(self._quests.values())
+
+        by_type, by_level = facet_counts(matches, types, min_level, max_level)
+        selected = [
+            quest
+            for quest in matches
+            if (not types or quest.type in types)
+            and matches_levels(quest, min_level, max_level)
+        ]
+        selected.sort(
+            key=lambda quest: (-scores.get(quest.id, 0.0), quest.created_at, quest.id)
+        )
+        return (
+            selected[skip : skip + limit],
+            len(selected),
+            {"type": by_type, "requiredLevel": by_level},
+        )
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "ready": self.ready,
+            "version": self.version,
+            "quests": len(self._quests),
+            "rewards": sum(len(rewards) for rewards in self._rewards.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": self.hits / total if total else 0.0,
+        }
+
+    async def get_quests(
+        self, db: AsyncSession, quest_ids: Iterable[UUID]
+    ) -> Dict[UUID, QuestSchema]:
+        """
+        Return the requested quests, fetching the missing ones in one batched select.
+        """
+        if self.serving():
+            return {
+                quest_id: self._quests[quest_id]
+                for quest_id in set(quest_ids)
+                if quest_id in self._quests
+            }
+        return await self._get_many(db, self.quests, QuestModel, QuestSchema, quest_ids)
+
+    async def get_achievements(
+        self, db: AsyncSession, achievement_ids: Iterable[UUID]
+    ) -> Dict[UUID, AchievementSchema]:
+        """
+        Return the requested achievements, fetching the missing ones in one batched select.
+        """
+        return await self._get_many(
+            db, self.achievements, AchievementModel, AchievementSchema, achievement_ids
+        )
+
+    # Writes
+
+    async def bump_version(self, db: AsyncSession) -> int:
+        """
+        Increment the catalog version inside the caller's transaction and return it.
+
+        Concurrent writers queue on the version row, so versions are applied in
+        commit order.
+        """
+        statement = pg_insert(CatalogState).values(id=CATALOG_STATE_ID, version=1)
+        return await db.scalar(
+            statement.on_conflict_do_update(
+                index_elements=[CatalogState.id],
+                set_={"version": CatalogState.version + 1},
+            ).returning(CatalogState.version)
+        )
+
+    async def quest_saved(self, db: AsyncSession, version: int, quest) -> None:
+        """Apply a created or updated quest, committed as `version`."""
+        item = QuestSchema.model_validate(quest)
+
+        def patch():
+            previous = self._quests.get(item.id)
+            if previous is not None:
+                self._keys.remove((previous.created_at, previous.id))
+            self._quests[item.id] = item
+            self._search_index.add(item)
+            self._keys.insert(
+                bisect_right(self._keys, (item.created_at, item.id)),
+                (item.created_at, item.id),
+            )
+
+        self.quests.pop(item.id)
+        await self._apply(db, version, patch)
+
+    async def quest_deleted(self, db: AsyncSession, version: int, quest_id: UUID) -> None:
+        def patch():
+            previous = self._quests.pop(quest_id, None)
+            if previous is not None:
+                self._keys.remove((previous.created_at, previous.id))
+            self._search_index.remove(quest_id)
+            self._rewards.pop(quest_id, None)
+            self._requirements.pop(quest_id, None)
+            if self._initial_quest_id == quest_id:
+                self._initial_quest_id = None
+
+        self.quests.pop(quest_id)
+        await self._apply(db, version, patch)
+
+    async def reward_saved(self, db: AsyncSession, version: int, reward) -> None:
+        """Apply a created or updated reward, committed as `version`."""
+        item = RewardSchema.model_validate(reward)
+
+        def patch():
+            for rewards in self._rewards.values():
+                rewards[:] = [other for other in rewards if other.id != item.id]
+            self._rewards.setdefault(item.quest_id, []).append(item)
+
+        await self._apply(db, version, patch)
+
+    async def reward_deleted(self, db: AsyncSession, version: int, reward) -> None:
+        def patch():
+            rewards = self._rewards.get(reward.quest_id, [])
+            rewards[:] = [other for other in rewards if other.id != reward.id]
+
+        await self._apply(db, version, patch)
+
+    def invalidate_quest(self, quest_id: UUID) -> None:
+        self.quests.pop(quest_id)
+
+    # Loading and reconciliation
+
+    async def load(self, db: AsyncSession) -> None:
+        """Replace the content with the quests, rewards and requirements in the database."""
+        # Read the version first: a write committed in between leaves the loaded
+        # version behind the data, which only causes one more reload later
+        version = await db.scalar(
+            select(CatalogState.version).where(CatalogState.id == CATALOG_STATE_ID)
+        )
+        quests = {
+            quest.id: QuestSchema.model_validate(quest)
+            for quest in (await db.execute(select(QuestModel))).scalars()
+        }
+        rewards = {}
+        for reward in (
+            await db.execute(select(RewardModel).order_by(RewardModel.created_at))
+        ).scalars():
+            rewards.setdefault(reward.quest_id, []).append(
+                RewardSchema.model_validate(reward)
+            )
+        requirements = {}
+        for requirement in (await db.execute(select(RequirementModel))).scalars():
+            requirements.setdefault(requirement.quest_id, []).append(
+                RequirementSchema.model_validate(requirement)
+            )
+        initial_quest_id = await db.scalar(select(InitialQuest.quest_id).limit(1))
+        search_index = QuestSearchIndex()
+        for quest in quests.values():
+            search_index.add(quest)
+
+        self._quests = quests
+        self._keys = sorted((quest.created_at, quest.id) for quest in quests.values())
+        self._rewards = rewards
+        self._requirements = requirements
+        self._initial_quest_id = initial_quest_id
+        self._search_index = search_index
+        self.version = version or 0
+        self.ready = True
+
+    async def reconcile_forever(self, session_factory, interval: float) -> None:
+        """Load the catalog, then reload it whenever the stored version moves on."""
+        while True:
+            try:
+                async with session_factory() as db:
+                    version = await db.scalar(
+                        select(CatalogState.version).where(
+                            CatalogState.id == CATALOG_STATE_ID
+                        )
+                    )
+                    if not self.ready or (version or 0) != self.version:
+                        await self.load(db)
+            except Exception as err:
+                print(f"Quest catalog reconciliation failed: {err}")
+            await asyncio.sleep(interval)
+
+    # Internals
+
+    async def _apply(self, db: AsyncSession, version: int, patch) -> None:
+        """Patch in the write committed as `version`, or rebuild if one was missed."""
+        if not (self.enabled and self.ready):
+            return
+        if self.version == version - 1:
+            patch()
+            self.version = version
+        else:
+            await self.load(db)
+
+    async def _get_many(self, db, cache, model, schema, ids) -> dict:
+        found = {}
+        missing = []
+        for item_id in set(ids):
+            item = cache.get(item_id)
+            if item is None:
+                missing.append(item_id)
+            else:
+                found[item_id] = item
+
+        if missing:
+            # One array parameter (`id = ANY(:ids)`) however many ids are missing
+            ids_param = bindparam("ids", missing, type_=ARRAY(PG_UUID(as_uuid=True)))
+            result = await db.execute(select(model).where(model.id == any_(ids_param)))
+            for row in result.scalars().all():
+                item = schema.model_validate(row)
+                cache.set(row.id, item)
+                found[row.id] = item
+
+        return found
+
+
+QUEST_CATALOG_ENABLED = os.getenv("QUEST_CATALOG_ENABLED", "true").lower() == "true"
+QUEST_CATALOG_RECONCILE_SECONDS = float(
+    os.getenv("QUEST_CATALOG_RECONCILE_SECONDS", "10")
+)
+
+catalog = Catalog(
+    maxsize=int(os.getenv("CATALOG_CACHE_SIZE", "10000")),
+    ttl=float(os.getenv("CATALOG_CACHE_TTL", "300")),
+    enabled=QUEST_CATALOG_ENABLED,
+)
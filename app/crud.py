@@ -1,4 +1,18 @@
-from sqlalchemy import select, desc, insert, update
+from sqlalchemy import (
+    select,
+    desc,
+    insert,
+    update,
+    delete,
+    exists,
+    literal,
+    or_,
+    and_,
+    case,
+    text,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
 from fastapi import HTTPException, status
@@ -13,20 +27,39 @@ from app.models import (
     UserAchievementModel,
     Reward as RewardModel,
     UserRewards as UserRewardsModel,
+    UserRoleModel,
     InitialQuest,
+    PointsLedger as PointsLedgerModel,
+    UserPointsDaily as UserPointsDailyModel,
+    LeaderboardSnapshot as LeaderboardSnapshotModel,
+    LeaderboardSnapshotState as LeaderboardSnapshotStateModel,
 )
 from app.schemas import (
     User as UserSchema,
     Quest as QuestSchema,
+    QuestDetail,
+    Requirement as RequirementSchema,
+    UserQuestProgressResponse,
     QuestBase as QuestCreateSchema,
     UserBase,
     Reward as RewardSchema,
     RewardBase as RewardBaseSchema,
+    UserQuestProgress as UserQuestProgressSchema,
+    UserAchievement as UserAchievementSchema,
 )
 from app.utils.photo_users import get_user_profile_photo_link
+from app.utils.cache import LRUCache
+from app.utils.cursor import encode_cursor
+from app.catalog import catalog
+from app.quest_search import LEVEL_RANGES, search_terms, tsquery_text
+from app.quest_transitions import REVIEW_PENDING, TASK_COMPLETED
+from app.rank_index import rank_index
 from uuid import UUID
+import os
 
 from sqlalchemy.orm import (
+    aliased,
+    load_only,
     selectinload,
     joinedload,
 )  # Import selectinload for eager loading of related rows
@@ -34,6 +67,40 @@ from sqlalchemy.orm import (
 from typing import Optional
 from datetime import datetime, timezone
 
+# In-process Telegram ID -> user UUID map used to resolve the caller on every quest transition.
+# Entries are dropped when the user is deleted; the TTL bounds staleness across workers.
+user_id_cache = LRUCache(
+    maxsize=int(os.getenv("USER_ID_CACHE_SIZE", "10000")),
+    ttl=float(os.getenv("USER_ID_CACHE_TTL", "600")),
+)
+
+# Total number of quests shown by listings; writes through create_quest and
+# delete_quest_in_db drop it, the TTL bounds staleness across workers
+QUEST_TOTAL_KEY = "quests"
+quest_total_cache = LRUCache(
+    maxsize=1, ttl=float(os.getenv("QUEST_TOTAL_CACHE_TTL", "60"))
+)
+
+# Role name -> role UUID, used to resolve leaderboard segments
+role_id_cache = LRUCache(maxsize=64, ttl=600)
+
+# Display columns of leaderboard users keyed by user UUID, so leaderboards served
+# from the rank index usually need no database round trip at all.
+leaderboard_profile_cache = LRUCache(
+    maxsize=int(os.getenv("LEADERBOARD_PROFILE_CACHE_SIZE", "10000")),
+    ttl=float(os.getenv("LEADERBOARD_PROFILE_CACHE_TTL", "60")),
+)
+
+# Periods (by length in days) with a precomputed leaderboard snapshot
+SNAPSHOT_PERIODS = {1: "day", 7: "week", 30: "month", None: "allTime"}
+LEADERBOARD_SNAPSHOTS_ENABLED = (
+    os.getenv("LEADERBOARD_SNAPSHOTS_ENABLED", "true").lower() == "true"
+)
+# Seconds between snapshot refreshes, and the age after which snapshots are not served
+LEADERBOARD_SNAPSHOT_SECONDS = float(os.getenv("LEADERBOARD_SNAPSHOT_SECONDS", "30"))
+LEADERBOARD_SNAPSHOT_MAX_AGE = float(os.getenv("LEADERBOARD_SNAPSHOT_MAX_AGE", "600"))
+# Advisory lock namespace taken by the worker refreshing a snapshot
+SNAPSHOT_LOCK_ID = 7341
 
 # Function to delete a user by their ID (Telegram_id) in a cascade manner
 
@@ -56,6 +123,9 @@ async def delete_user_by_id(db: AsyncSession, user_id: int):
     if user:
         await db.delete(user)
         await db.commit()
+        user_id_cache.pop(user_id)  # Forget the cached Telegram ID -> UUID mapping
+        rank_index.remove(user.id)
+        leaderboard_profile_cache.pop(user.id)
         return True  # Return True if the deletion was successful
     return False  # Return False if no user was found
 
@@ -69,7 +139,9 @@ async def delete_reward_by_id(reward_id: UUID, db: AsyncSession):
 
     if reward:
         await db.delete(reward)
+        version = await catalog.bump_version(db)
         await db.commit()
+        await catalog.reward_deleted(db, version, reward)
         return True
 
     raise HTTPException(status_code=404, detail="Reward not found")
@@ -96,39 +168,115 @@ async def create_user(db: AsyncSession, user_data: UserBase):
     db.add(new_user)
     await db.commit()
     await db.refresh(new_user)
+    rank_index.update(new_user.id, new_user.points)
     return new_user
 
 
 async def get_user_by_tID(db: AsyncSession, telegram_id: int) -> Optional[UserSchema]:
-    # Create a select query to find a user with the given telegram_id and load related quest progress, achievements, and role
-    query = (
-        select(UserModel)
+    """
+    Load the full user profile (role, quest progress and achievements) by Telegram ID.
+
+    The user, the progress rows and the achievement rows are fetched with separate
+    column-only selects, so the result sets are not multiplied with each other.
+    Quest and achievement details come from the shared catalog instead of being
+    joined into every row.
+    """
+    # User columns together with the role name (many-to-one, no row multiplication)
+    user_result = await db.execute(
+        select(UserModel.__table__, UserRoleModel.role_name)
+        .outerjoin(UserRoleModel, UserRoleModel.id == UserModel.role_id)
         .where(UserModel.telegram_id == telegram_id)
-        .options(
-            joinedload(UserModel.quest_progress).joinedload(
-                UserQuestProgressModel.quest
-            ),  # Load quest progress and related quest
-            joinedload(UserModel.achievements).joinedload(
-                UserAchievementModel.achievement
-            ),  # Load achievements and related achievement details
-            joinedload(UserModel.role),  # Load the role relationship
+    )
+    user = user_result.first()
+
+    if not user:
+        return None  # Return None if no user is found
+
+    # Newest quest progress first, ordered by the database
+    progress_result = await db.execute(
+        select(UserQuestProgressModel.__table__)
+        .where(UserQuestProgressModel.user_id == user.id)
+        .order_by(
+            UserQuestProgressModel.created_at.desc(), UserQuestProgressModel.id.desc()
         )
     )
+    progress_rows = progress_result.all()
 
-    result = await db.execute(query)  # Execute the query asynchronously
-    user = result.scalars().first()  # Get the first result (or None if no user found)
+    achievements_result = await db.execute(
+        select(UserAchievementModel.__table__).where(
+            UserAchievementModel.user_id == user.id
+        )
+    )
+    achievement_rows = achievements_result.all()
 
-    if user:
-        # If the user is found, reverse the quest_progress list
-        user.quest_progress = list(
-            reversed(user.quest_progress)
-        )  # Reverse the list in place
-        # Return the user as a Pydantic model (UserSchema)
-        return UserSchema.model_validate(
-            user
-        )  # Pydantic's ORM mode will handle conversion
-    else:
-        return None  # Return None if no user is found
+    # Quest and achievement details are shared between users
+    quests = await catalog.get_quests(db, (row.quest_id for row in progress_rows))
+    achievements = await catalog.get_achievements(
+        db, (row.achievement_id for row in achievement_rows)
+    )
+
+    quest_progress = []
+    for row in progress_rows:
+        progress = UserQuestProgressSchema.model_validate(row)
+        progress.quest = quests.get(row.quest_id)
+        quest_progress.append(progress)
+
+    user_achievements = []
+    for row in achievement_rows:
+        user_achievement = UserAchievementSchema.model_validate(row)
+        user_achievement.achievement = achievements.get(row.achievement_id)
+        user_achievements.append(user_achievement)
+
+    # Return the user as a Pydantic model (UserSchema)
+    return UserSchema.model_validate(
+        {
+            **user._mapping,
+            "role": {"role_name": user.role_name},
+            "quest_progress": quest_progress,
+            "achievements": user_achievements,
+        }
+    )
+
+
+async def get_user_id_by_tID(db: AsyncSession, telegram_id: int) -> Optional[UUID]:
+    """
+    Resolve a Telegram ID to the user's UUID.
+
+    Served from the in-process cache when possible, otherwise with a single
+    indexed lookup of the id column only.
+    """
+    user_id = user_id_cache.get(telegram_id)
+    if user_id is not None:
+        return user_id
+
+    result = await db.execute(
+        select(UserModel.id).where(UserModel.telegram_id == telegram_id)
+    )
+    user_id = result.scalar_one_or_none()
+
+    # Unknown users are not cached so that they resolve as soon as they register
+    if user_id is not None:
+        user_id_cache.set(telegram_id, user_id)
+
+    return user_id
+
+
+async def get_role_id_by_name(db: AsyncSession, role_name: str) -> Optional[UUID]:
+    """
+    Resolve a role name to its UUID, cached in-process as roles rarely change.
+    """
+    role_id = role_id_cache.get(role_name)
+    if role_id is not None:
+        return role_id
+
+    result = await db.execute(
+        select(UserRoleModel.id).where(UserRoleModel.role_name == role_name)
+    )
+    role_id = result.scalar_one_or_none()
+    if role_id is not None:
+        role_id_cache.set(role_name, role_id)
+
+    return role_id
 
 
 # Function to create a new quest in the database
@@ -175,10 +323,13 @@ async def create_quest(quest: QuestCreateSchema, db: AsyncSession):
     data = quest.dict()
     query = QuestModel.__table__.insert().values(**data)
     result = await db.execute(query)
+    version = await catalog.bump_version(db)
     await db.commit()
+    quest_total_cache.pop(QUEST_TOTAL_KEY)
 
     # Retrieve the newly created Quest object
     created_quest = await db.get(QuestModel, result.inserted_primary_key[0])
+    await catalog.quest_saved(db, version, created_quest)
     return created_quest
 
 
@@ -192,41 +343,188 @@ async def create_quest(quest: QuestCreateSchema, db: AsyncSession):
 
 async def create_reward(quest: UUID, reward: RewardBaseSchema, db: AsyncSession):
     # Create an insert query for the RewardModel table with the provided reward  data
-    query = RewardModel.__table__.insert().values(
-        description=reward.description,
-        quest_id=quest,
-        coins=reward.coins,
-        points=reward.points,
-        level_increase=reward.level_increase,
-        created_at=datetime.now(),
+    query = (
+        insert(RewardModel)
+        .values(
+            description=reward.description,
+            quest_id=quest,
+            coins=reward.coins,
+            points=reward.points,
+            level_increase=reward.level_increase,
+            created_at=datetime.now(),
+        )
+        .returning(RewardModel)
     )
 
-    result = await db.execute(query)  # Execute the query asynchronously
+    created_reward = await db.scalar(query)  # Execute the query asynchronously
+    version = await catalog.bump_version(db)
     await db.commit()  # Commit the transaction
+    await catalog.reward_saved(db, version, created_reward)
     # Return the quest data with the newly inserted ID
     return {
         **reward.model_dump(),
         "quest_id": quest,
-        "id": result.inserted_primary_key[0],
+        "id": created_reward.id,
     }
 
 
 # Function to retrieve a list of quests with optional pagination
-async def get_quests(db: AsyncSession, skip: int = 0, limit: int = 10):
-    # Create a query to select quests with pagination using offset and limit
-    query = select(QuestModel).offset(skip).limit(limit)
+async def get_quests(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 10,
+    after: Optional[tuple] = None,
+):
+    """
+    Page of quests ordered by (created_at, id).
 
-    # Execute the query asynchronously and get the result
-    result = await db.execute(query)
+    - **skip**: Number of quests to skip (offset pagination, kept for compatibility).
+    - **limit**: Maximum number of quests to return.
+    - **after**: (created_at, id) of the last quest of the previous page; when
+      given, the page is read with a keyset range instead of an offset, so deep
+      pages cost the same as the first one.
+
+    Returns the quests and the (created_at, id) key to continue after, or None on
+    the last page. The page is served from the quest catalog once it is loaded.
+    """
+    if catalog.serving():
+        return catalog.page(skip, limit, after)
 
-    # Extract the list of quests from the result
+    query = select(QuestModel).order_by(QuestModel.created_at, QuestModel.id)
+    if after is not None:
+        query = query.where(tuple_(QuestModel.created_at, QuestModel.id) > tuple_(*after))
+    else:
+        query = query.offset(skip)
+
+    # One extra row tells whether another page follows
+    result = await db.execute(query.limit(limit + 1))
     quests = result.scalars().all()
+    next_key = None
+    if len(quests) > limit:
+        quests = quests[:limit]
+        next_key = (quests[-1].created_at, quests[-1].id)
+
+    # Map the SQLAlchemy quest objects to Pydantic models
+    return [QuestSchema.from_orm(quest) for quest in quests], next_key
+
+
+async def get_quest_total(db: AsyncSession, estimated: bool = False):
+    """
+    Total number of quests for listings.
 
-    # Create a separate query to count the total number of quests in the database
-    total_count = await db.execute(select(func.count()).select_from(QuestModel))
+    The exact count is cached in-process and dropped by `create_quest` and
+    `delete_quest_in_db`, so most listings do not run a second query. With
+    `estimated`, a cache miss reads the planner's row estimate for the table
+    instead of counting, which stays cheap however large it grows.
 
-    # Map the SQLAlchemy quest objects to Pydantic models and return them along with the total count
-    return [QuestSchema.from_orm(quest) for quest in quests], total_count.scalar()
+    Returns the total and whether it is an estimate.
+    """
+    if catalog.serving():
+        return catalog.total(), False
+
+    total = quest_total_cache.get(QUEST_TOTAL_KEY)
+    if total is not None:
+        return total, False
+
+    if estimated:
+        estimate = await db.scalar(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'quests'::regclass")
+        )
+        # Tables that were never vacuumed or analyzed report -1
+        if estimate is not None and estimate >= 0:
+            return estimate, True
+
+    total = await db.scalar(select(func.count()).select_from(QuestModel))
+    quest_total_cache.set(QUEST_TOTAL_KEY, total)
+    return total, False
+
+
+async def search_quests(
+    db: AsyncSession,
+    query: Optional[str] = None,
+    types: Optional[list] = None,
+    min_level: Optional[int] = None,
+    max_level: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 20,
+):
+    """
+    Full-text search over the quest name, type and descriptions.
+
+    - **query**: Words to search for; every word must match the start of a word
+      of the quest. Without words, all quests match.
+    - **types**: Only return quests of these types.
+    - **min_level** / **max_level**: Only return quests whose required level is
+      within this range.
+
+    Results are ranked by relevance (name matches first, then type, description
+    and long description), then by creation time. Served from the quest
+    catalog's inverted index once it is loaded, otherwise from the GIN-indexed
+    `search_vector` column.
+
+    Returns the page of quests, the number of matching quests and the facet
+    counts per type and required level range.
+    """
+    terms = search_terms(query or "")
+    if catalog.serving():
+        return catalog.search(terms, types, min_level, max_level, skip, limit)
+
+    match_conditions = []
+    rank = literal(0.0)
+    if terms:
+        tsquery = func.to_tsquery("simple", tsquery_text(terms))
+        match_conditions.append(QuestModel.search_vector.bool_op("@@")(tsquery))
+        rank = func.ts_rank(QuestModel.search_vector, tsquery)
+
+    type_conditions = [QuestModel.type.in_(types)] if types else []
+    level_conditions = []
+    if min_level is not None:
+        level_conditions.append(QuestModel.required_level >= min_level)
+    if max_level is not None:
+        level_conditions.append(QuestModel.required_level <= max_level)
+
+    # Each facet is counted without its own filter, so the counts show what
+    # selecting another value would return
+    type_counts = await db.execute(
+        select(QuestModel.type, func.count())
+        .where(*match_conditions, *level_conditions)
+        .group_by(QuestModel.type)
+    )
+    by_type = dict(type_counts.all())
+
+    level_bucket = case(
+        *(
+            (
+                and_(
+                    QuestModel.required_level >= lowest,
+                    QuestModel.required_level <= highest
+                    if highest is not None
+                    else literal(True),
+                ),
+                label,
+            )
+            for label, lowest, highest in LEVEL_RANGES
+        )
+    )
+    level_counts = await db.execute(
+        select(level_bucket, func.count())
+        .where(*match_conditions, *type_conditions)
+        .group_by(level_bucket)
+    )
+    by_level = {label: count for label, count in level_counts.all() if label}
+
+    total = sum(
+        count for quest_type, count in by_type.items() if not types or quest_type in types
+    )
+    result = await db.execute(
+        select(QuestModel)
+        .where(*match_conditions, *type_conditions, *level_conditions)
+        .order_by(rank.desc(), QuestModel.created_at, QuestModel.id)
+        .offset(skip)
+        .limit(limit)
+    )
+    quests = [QuestSchema.from_orm(quest) for quest in result.scalars().all()]
+    return quests, total, {"type": by_type, "requiredLevel": by_level}
 
 
 # Function to retrieve one quest by ID
@@ -243,6 +541,181 @@ async def get_quest_by_id(db: AsyncSession, quest_id: UUID):
     return await db.get(QuestModel, quest_id)  # Use get for single object retrieval
 
 
+async def get_quest(db: AsyncSession, quest_id: UUID):
+    """
+    Read-only quest lookup, served from the quest catalog once it is loaded.
+
+    Use `get_quest_by_id` for a quest that is going to be modified.
+    """
+    if catalog.serving():
+        return catalog.quest(quest_id)
+    quest = await get_quest_by_id(db, quest_id)
+    return QuestSchema.from_orm(quest) if quest else None
+
+
+async def get_quest_detail(
+    db: AsyncSession, quest_id: UUID, user_id: UUID
+) -> Optional[QuestDetail]:
+    """
+    Quest with its rewards, its requirements and the user's progress on it.
+
+    With the quest catalog loaded only the progress row is read (one query);
+    otherwise the quest and progress row come from one outer join and the
+    rewards and requirements from two batched selectin loads.
+
+    Returns None if the quest does not exist.
+    """
+    progress_on_quest = and_(
+        UserQuestProgressModel.quest_id == QuestModel.id,
+        UserQuestProgressModel.user_id == user_id,
+    )
+
+    if catalog.serving():
+        quest = catalog.quest(quest_id)
+        if quest is None:
+            return None
+        rewards = catalog.rewards(quest_id)
+        requirements = catalog.requirements(quest_id)
+        progress = await db.scalar(
+            select(UserQuestProgressModel)
+            .join(QuestModel, progress_on_quest)
+            .where(QuestModel.id == quest_id)
+            .order_by(UserQuestProgressModel.created_at.desc())
+            .limit(1)
+        )
+    else:
+        result = await db.execute(
+            select(QuestModel, UserQuestProgressModel)
+            .outerjoin(UserQuestProgressModel, progress_on_quest)
+            .where(QuestModel.id == quest_id)
+            .order_by(UserQuestProgressModel.created_at.desc())
+            .limit(1)
+            .options(
+                selectinload(QuestModel.rewards),
+                selectinload(QuestModel.requirements_table),
+            )
+        )
+        row = result.first()
+        if row is None:
+            return None
+        quest, progress = row
+        rewards = quest.rewards
+        requirements = quest.requirements_table
+
+    return QuestDetail(
+        **QuestSchema.model_validate(quest).model_dump(),
+        rewards=[RewardSchema.model_validate(reward) for reward in rewards],
+        requirement_items=[
+            RequirementSchema.model_validate(requirement)
+            for requirement in requirements
+        ],
+        progress=(
+            UserQuestProgressResponse.model_validate(progress) if progress else None
+        ),
+    )
+
+
+async def get_quests_progress(
+    db: AsyncSession, user_id: UUID, since: Optional[datetime] = None
+):
+    """
+    The user's progress rows, reading only the columns of `QuestProgressItem`.
+
+    - **since**: Only rows created or changed after this time.
+
+    Returns the rows keyed by quest id.
+    """
+    # Rows not updated since their creation have no updated_at yet
+    changed_at = func.coalesce(
+        UserQuestProgressModel.updated_at, UserQuestProgressModel.created_at
+    )
+    query = select(
+        UserQuestProgressModel.id,
+        UserQuestProgressModel.quest_id,
+        UserQuestProgressModel.status,
+        UserQuestProgressModel.progress,
+        UserQuestProgressModel.is_locked,
+        UserQuestProgressModel.mentor_comment,
+        UserQuestProgressModel.is_reward_accepted,
+        UserQuestProgressModel.started_at,
+        UserQuestProgressModel.completed_at,
+        changed_at.label("updated_at"),
+    ).where(UserQuestProgressModel.user_id == user_id)
+    if since is not None:
+        query = query.where(changed_at > since)
+
+    result = await db.execute(query)
+    return {row.quest_id: row for row in result}
+
+
+async def get_review_queue(
+    db: AsyncSession,
+    limit: int = 50,
+    after: Optional[tuple] = None,
+    quest_id: Optional[UUID] = None,
+    user_class: Optional[str] = None,
+):
+    """
+    Page of submissions waiting for mentor review, oldest first.
+
+    - **limit**: Maximum number of submissions to return.
+    - **after**: (submitted_at, id) of the last submission of the previous page.
+    - **quest_id**: Only submissions of this quest.
+    - **user_class**: Only submissions of users of this class.
+
+    The rows are read in (submitted_at, id) order from the partial index on
+    REVIEW_PENDING rows, joined with their users in the same query; the quests
+    come from the catalog (one batched select while it is not loaded). A page
+    costs at most two queries whatever its size.
+
+    Returns the progress rows, the users and quests they reference (by id) and
+    the (submitted_at, id) key to continue after, or None on the last page.
+    """
+    query = (
+        select(UserQuestProgressModel, UserModel)
+        .join(UserModel, UserModel.id == UserQuestProgressModel.user_id)
+        # Inlined rather than bound, so that prepared (generic) plans still
+        # match the predicate of the partial index
+        .where(
+            UserQuestProgressModel.status
+            == literal(REVIEW_PENDING, literal_execute=True)
+        )
+        .order_by(UserQuestProgressModel.submitted_at, UserQuestProgressModel.id)
+        .options(
+            # Only the columns shown in the queue, not the user's profile relations
+            load_only(
+                UserModel.id,
+                UserModel.first_name,
+                UserModel.last_name,
+                UserModel.username,
+                UserModel.user_class,
+                UserModel.image_url,
+            )
+        )
+    )
+    if after is not None:
+        query = query.where(
+            tuple_(UserQuestProgressModel.submitted_at, UserQuestProgressModel.id)
+            > tuple_(*after)
+        )
+    if quest_id is not None:
+        query = query.where(UserQuestProgressModel.quest_id == quest_id)
+    if user_class is not None:
+        query = query.where(UserModel.user_class == user_class)
+
+    # One extra row tells whether another page follows
+    rows = (await db.execute(query.limit(limit + 1))).all()
+    next_key = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1][0]
+        next_key = (last.submitted_at, last.id)
+
+    users = {user.id: user for _, user in rows}
+    quests = await catalog.get_quests(db, {progress.quest_id for progress, _ in rows})
+    return [progress for progress, _ in rows], users, quests, next_key
+
+
 async def assign_initial_quests(db: AsyncSession, user_id: UUID):
     """
     Assign 4 quests to a new user, with 2 being blocked and 2 being active.
@@ -317,136 +790,697 @@ async def assign_initial_achievements(db: AsyncSession, user_id: UUID):
     await db.commit()
 
 
-async def get_data_leaderboard(telegram_id: int, days: int, db: AsyncSession):
-    cutoff_date = datetime.utcnow() - timedelta(days=days)
-    # Query to select the top users ordered by points in descending order within the time frame
-    query_top = (
-        select(UserModel)
-        .where(UserModel.updated_at >= cutoff_date)
-        .order_by(desc(UserModel.points))
-    )
-    # Query to select the specific user based on telegram_id
-    query_user = select(UserModel).order_by(desc(UserModel.points))
-    result_top = await db.execute(
-        query_top
-    )  # Execute the top users query asynchronously
-    result_user = await db.execute(query_user)  # Execute the user query asynchronously
-
-    all_users = result_top.scalars().all()
-    user_info = result_user.scalars().all()
-    users_list = []
-    current_user = None
-    for index, user in enumerate(all_users):
-        if index == days:
-            break
-        user_data = {
-            "id": str(user.id),
-            "telegramId": str(user.telegram_id),
-            "firstName": user.first_name,
-            "lastName": user.last_name,
-            "imageUrl": user.image_url,
-            "points": user.points,
-            "position": index + 1,
-            "isCurrentUser": user.telegram_id == telegram_id,
-        }
-        users_list.append(user_data)
-        if index == days:
-            break
-
-    for index, user in enumerate(user_info):
-        if user.telegram_id == telegram_id:
-            current_user = {
-                "id": str(user.id),
-                "telegramId": str(user.telegram_id),
-                "firstName": user.first_name,
-                "lastName": user.last_name,
-                "imageUrl": user.image_url,
-                "points": user.points,
-                "position": index + 1,
-                "isCurrentUser": True,
-            }
-            break
+# Only the columns rendered by the leaderboard are selected
+LEADERBOARD_COLUMNS = (
+    UserModel.id,
+    UserModel.telegram_id,
+    UserModel.first_name,
+    UserModel.last_name,
+    UserModel.image_url,
+)
 
+
+def leaderboard_entry(row, points: int, position: int, telegram_id: int) -> dict:
     return {
-        "users": users_list,
-        "currentUser": current_user,
+        "id": str(row.id),
+        "telegramId": str(row.telegram_id),
+        "firstName": row.first_name,
+        "lastName": row.last_name,
+        "imageUrl": row.image_url,
+        "points": points,
+        "position": position,
+        "isCurrentUser": row.telegram_id == telegram_id,
     }
 
 
-async def complete_quest_and_take_rewards(
-    user_id: UUID, quest_id: UUID, db: AsyncSession
+def points_changed(user_id: UUID, points: int):
+    """
+    Propagate committed user points/profile changes to the in-process leaderboard state.
+    """
+    rank_index.update(user_id, points)
+    leaderboard_profile_cache.pop(user_id)
+
+
+async def get_leaderboard_profiles(db: AsyncSession, user_ids) -> dict:
+    """
+    Display columns of the given users, fetching the uncached ones by primary key.
+    """
+    profiles = {}
+    missing = []
+    for user_id in user_ids:
+        row = leaderboard_profile_cache.get(user_id)
+        if row is None:
+            missing.append(user_id)
+        else:
+            profiles[user_id] = row
+
+    if missing:
+        result = await db.execute(
+            select(*LEADERBOARD_COLUMNS).where(UserModel.id.in_(missing))
+        )
+        for row in result.all():
+            leaderboard_profile_cache.set(row.id, row)
+            profiles[row.id] = row
+
+    return profiles
+
+
+async def record_points_change(
+    db: AsyncSession, user_id: UUID, delta: int, source: str
 ):
     """
+    Append a points change to the ledger and add it to today's rollup.
 
-    This function verification if Quest completed
-    fetch the reward for quest and insert info in user_rewards if all condition done, update user and give rewards
-    with update user data.
+    Runs in the caller's transaction; the caller commits together with the
+    change of users.points itself.
 
     - **db**: Database session dependency.
-    - **user_id**: ID of the user who completed quest.
-    - **quest_id** ID of the completed quest.
+    - **user_id**: ID of the user whose points changed.
+    - **delta**: Signed number of points added.
+    - **source**: What caused the change ("quest_reward", "admin_edit", ...).
     """
-    query_user = select(UserModel).where(UserModel.id == user_id)
-    user_response = await db.execute(query_user)
-    user = user_response.scalar_one_or_none()
+    if not delta:
+        return
 
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    await db.execute(
+        insert(PointsLedgerModel).values(user_id=user_id, delta=delta, source=source)
+    )
+    rollup = pg_insert(UserPointsDailyModel).values(
+        user_id=user_id, day=func.current_date(), points=delta
+    )
+    await db.execute(
+        rollup.on_conflict_do_update(
+            index_elements=[UserPointsDailyModel.user_id, UserPointsDailyModel.day],
+            set_={"points": UserPointsDailyModel.points + rollup.excluded.points},
+        )
+    )
+
+
+async def get_data_leaderboard(
+    telegram_id: int,
+    days: Optional[int],
+    limit: int,
+    db: AsyncSession,
+    around: Optional[int] = None,
+    cursor: Optional[dict] = None,
+    segment: tuple = (),
+):
+    """
+    Build the leaderboard with the ranking computed by the database.
+
+    - **telegram_id**: Telegram ID of the current user.
+    - **days**: Length of the time window in days, or None for all-time points.
+    - **limit**: Number of users per page.
+    - **db**: Database session dependency.
+    - **around**: Return the current user with this many users above and below
+      instead of the top users.
+    - **cursor**: Decoded `prevCursor`/`nextCursor` of a previous response
+      (points, id, position and direction of its boundary row) to scroll from.
+    - **segment**: Conditions from `leaderboard_segment` ranking only a class or
+      role of users; positions are counted within the segment.
+
+    Windowed leaderboards rank the points earned within the last `days` days
+    (from the daily rollups); all-time ranks users.points. Users are ordered by
+    (points, id) descending and every page is read with a keyset range on that
+    key, so scrolling deep into the table costs the same as reading the top.
+    The current user comes with their position (1 + number of users ranked
+    above) on top and around pages. All-time top and around pages are served
+    from the in-process rank index once it is loaded; otherwise the day, week,
+    month and all-time pages are read from their background-refreshed snapshot
+    when it is fresh enough, and the response reports its staleness. Segments
+    are always ranked by the database through their indexes.
+    """
+    if not segment:
+        if days is None and rank_index.ready and cursor is None:
+            return await get_leaderboard_from_index(telegram_id, limit, around, db)
+
+        snapshot_page = await get_leaderboard_from_snapshot(
+            telegram_id, days, limit, around, cursor, db
+        )
+        if snapshot_page is not None:
+            return snapshot_page
+
+    if cursor is not None:
+        key = (cursor["points"], cursor["id"])
+        users_list, has_more = await get_leaderboard_slice(
+            db,
+            days,
+            key,
+            cursor["direction"],
+            limit,
+            cursor["position"],
+            telegram_id,
+            segment,
+        )
+        if cursor["direction"] == "prev":
+            return leaderboard_page(users_list, has_more, True, None)
+        return leaderboard_page(users_list, True, has_more, None)
+
+    me = await get_leaderboard_position(db, days, telegram_id, segment)
+    current_user = (
+        leaderboard_entry(me, me.points, me.position, telegram_id) if me else None
+    )
+
+    if around is None:
+        users_list, has_more = await get_leaderboard_slice(
+            db, days, None, "next", limit, 0, telegram_id, segment
+        )
+        return leaderboard_page(users_list, False, has_more, current_user)
+
+    if current_user is None:
+        return leaderboard_page([], False, False, None)
 
-    quest_query = (
-        select(UserQuestProgressModel)
-        .where(UserQuestProgressModel.user_id == user_id)
-        .where(UserQuestProgressModel.quest_id == quest_id)
+    key = (me.points, me.id)
+    above, more_above = await get_leaderboard_slice(
+        db, days, key, "prev", around, me.position, telegram_id, segment
     )
-    quest_response = await db.execute(quest_query)
-    quest_progress = quest_response.scalar_one_or_none()
+    below, more_below = await get_leaderboard_slice(
+        db, days, key, "next", around, me.position, telegram_id, segment
+    )
+    return leaderboard_page(
+        above + [current_user] + below, more_above, more_below, current_user
+    )
+
+
+def leaderboard_ranking(days: Optional[int], segment: tuple = ()):
+    """
+    Ranking of the period as a (user_id, points) subquery, restricted to the
+    users matching the `segment` conditions.
+    """
+    if days is None:
+        return (
+            select(UserModel.id.label("user_id"), UserModel.points.label("points"))
+            .where(*segment)
+            .subquery()
+        )
 
-    if not quest_progress or quest_progress.status != "completed":
-        raise HTTPException(status_code=409, detail="Quest not completed yet.")
+    since = func.current_date() - (days - 1)
+    # Only the rollup rows of the window are read, independent of the number of users
+    ranking = select(
+        UserPointsDailyModel.user_id,
+        func.sum(UserPointsDailyModel.points).label("points"),
+    ).where(UserPointsDailyModel.day >= since)
+    if segment:
+        ranking = ranking.join(
+            UserModel, UserModel.id == UserPointsDailyModel.user_id
+        ).where(*segment)
+    return ranking.group_by(UserPointsDailyModel.user_id).subquery()
+
+
+def leaderboard_segment(
+    user_class: Optional[str] = None, role_id: Optional[UUID] = None
+) -> tuple:
+    """
+    Conditions on users selecting a leaderboard segment; empty for everyone.
 
-    reward_query = select(RewardModel).where(RewardModel.quest_id == quest_id)
-    reward_response = await db.execute(reward_query)
-    reward_result = reward_response.scalar_one_or_none()
+    Segments are served by the (user_class, points, id) and (role_id, points, id)
+    indexes, so a segment page costs the same as a page of the full leaderboard.
+    """
+    segment = ()
+    if user_class is not None:
+        segment += (UserModel.user_class == user_class,)
+    if role_id is not None:
+        segment += (UserModel.role_id == role_id,)
+    return segment
 
-    if not reward_result:  # If not reward raise HTTPException
-        raise HTTPException(status_code=404, detail="No reward found for this quest.")
 
-    user_reward_query = select(UserRewardsModel).where(
-        UserRewardsModel.user_id == user_id
+def leaderboard_rows(days: Optional[int], segment: tuple = ()):
+    """
+    Select of the leaderboard columns with the period's points, and its ranking key.
+
+    All-time rows are read straight from users, so pages are index-only scans of
+    the covering (points, id) index, or of the segment's index.
+    """
+    if days is None:
+        return select(*LEADERBOARD_COLUMNS, UserModel.points).where(*segment), (
+            UserModel.points,
+            UserModel.id,
+        )
+
+    ranking = leaderboard_ranking(days, segment)
+    rows = select(*LEADERBOARD_COLUMNS, ranking.c.points).join(
+        ranking, ranking.c.user_id == UserModel.id
     )
-    user_reward_response = await db.execute(user_reward_query)
-    user_reward_result = user_reward_response.scalar_one_or_none()
+    return rows, (ranking.c.points, ranking.c.user_id)
+
+
+async def get_leaderboard_slice(
+    db: AsyncSession,
+    days: Optional[int],
+    key: Optional[tuple],
+    direction: str,
+    limit: int,
+    key_position: int,
+    telegram_id: int,
+    segment: tuple = (),
+):
+    """
+    Up to `limit` users ranked right below ("next") or above ("prev") a (points, id) key.
 
-    if user_reward_result:  # If user take already reward, raise HTTPException
-        raise HTTPException(
-            status_code=409, detail="Reward for this quest has already been claimed"
+    The rows are returned in leaderboard order with positions counted from
+    `key_position`, the position of the key itself (0 reads from the top).
+    Also returns whether more users follow in that direction.
+    """
+    rows, (points, user_id) = leaderboard_rows(days, segment)
+    if direction == "next":
+        if key is not None:
+            rows = rows.where(tuple_(points, user_id) < tuple_(*key))
+        rows = rows.order_by(points.desc(), user_id.desc())
+    else:
+        rows = rows.where(tuple_(points, user_id) > tuple_(*key))
+        rows = rows.order_by(points.asc(), user_id.asc())
+
+    result = (await db.execute(rows.limit(limit + 1))).all()
+    has_more = len(result) > limit
+    result = result[:limit]
+
+    if direction == "next":
+        first_position = key_position + 1
+    else:
+        result.reverse()
+        first_position = key_position - len(result)
+
+    users_list = [
+        leaderboard_entry(row, row.points, first_position + index, telegram_id)
+        for index, row in enumerate(result)
+    ]
+    return users_list, has_more
+
+
+async def get_leaderboard_position(
+    db: AsyncSession, days: Optional[int], telegram_id: int, segment: tuple = ()
+):
+    """
+    The user's leaderboard row with their period points and position,
+    counted as 1 + the number of users ranked above. None for unknown users
+    and users outside the segment.
+    """
+    ranking = leaderboard_ranking(days, segment)
+    my_points = func.coalesce(
+        select(ranking.c.points)
+        .where(ranking.c.user_id == UserModel.id)
+        .correlate(UserModel)
+        .scalar_subquery(),
+        0,
+    )
+    above = ranking.alias("above")
+    position = (
+        select(func.count())
+        .select_from(above)
+        .where(tuple_(above.c.points, above.c.user_id) > tuple_(my_points, UserModel.id))
+        .correlate(UserModel)
+        .scalar_subquery()
+    )
+    query_user = select(
+        *LEADERBOARD_COLUMNS,
+        my_points.label("points"),
+        (position + 1).label("position"),
+    ).where(UserModel.telegram_id == telegram_id, *segment)
+    result_user = await db.execute(query_user)
+    return result_user.first()
+
+
+def leaderboard_page(
+    users_list: list,
+    has_prev: bool,
+    has_next: bool,
+    current_user: Optional[dict],
+    stale_seconds: float = 0.0,
+) -> dict:
+    """
+    Leaderboard response with cursors continuing above and below the page,
+    and the age of the data it was computed from.
+    """
+    refreshed_at = datetime.now(timezone.utc) - timedelta(seconds=stale_seconds)
+    return {
+        "users": users_list,
+        "currentUser": current_user,
+        "refreshedAt": refreshed_at.isoformat(),
+        "staleSeconds": round(stale_seconds, 3),
+        "prevCursor": (
+            leaderboard_cursor(users_list[0], "prev")
+            if users_list and has_prev
+            else None
+        ),
+        "nextCursor": (
+            leaderboard_cursor(users_list[-1], "next")
+            if users_list and has_next
+            else None
+        ),
+    }
+
+
+def leaderboard_cursor(entry: dict, direction: str) -> str:
+    return encode_cursor(
+        {
+            "points": entry["points"],
+            "id": entry["id"],
+            "position": entry["position"],
+            "direction": direction,
+        }
+    )
+
+
+async def refresh_leaderboard_snapshots(db: AsyncSession):
+    """
+    Recompute the leaderboard snapshot of every period whose source data changed.
+
+    The source version combines the last ledger entry, the number of users and
+    the current date, so untouched periods are skipped entirely. Changed periods
+    are ranked in one statement that only rewrites rows whose points or position
+    moved, followed by a delete of users that left the ranking. Each period is
+    refreshed in its own transaction under an advisory lock, so readers always
+    see a complete snapshot and only one worker refreshes at a time.
+
+    - **db**: Database session dependency.
+    """
+    version_row = (
+        await db.execute(
+            select(
+                select(func.coalesce(func.max(PointsLedgerModel.id), 0))
+                .scalar_subquery()
+                .label("ledger_id"),
+                select(func.count()).select_from(UserModel).scalar_subquery().label("users"),
+                func.current_date().label("day"),
+            )
         )
-    # Creating record in template user_rewards.
-    await db.execute(
-        insert(UserRewardsModel).values(
-            user_id=user_id,
-            reward_id=reward_result.id,
-            received_at=datetime.now(),
+    ).one()
+    source_version = f"{version_row.ledger_id}:{version_row.users}:{version_row.day}"
+    await db.commit()
+
+    for lock_key, (days, period) in enumerate(SNAPSHOT_PERIODS.items()):
+        state_version = await db.scalar(
+            select(LeaderboardSnapshotStateModel.source_version).where(
+                LeaderboardSnapshotStateModel.period == period
+            )
+        )
+        if state_version == source_version:
+            await db.commit()
+            continue
+
+        locked = await db.scalar(
+            select(func.pg_try_advisory_xact_lock(SNAPSHOT_LOCK_ID, lock_key))
+        )
+        if not locked:
+            await db.commit()
+            continue  # Another worker is refreshing this period
+
+        ranking = leaderboard_ranking(days)
+        ranked = select(
+            literal(period),
+            ranking.c.user_id,
+            ranking.c.points,
+            func.row_number().over(
+                order_by=(ranking.c.points.desc(), ranking.c.user_id.desc())
+            ),
         )
+        upsert = pg_insert(LeaderboardSnapshotModel).from_select(
+            ["period", "user_id", "points", "position"], ranked
+        )
+        await db.execute(
+            upsert.on_conflict_do_update(
+                index_elements=[
+                    LeaderboardSnapshotModel.period,
+                    LeaderboardSnapshotModel.user_id,
+                ],
+                set_={
+                    "points": upsert.excluded.points,
+                    "position": upsert.excluded.position,
+                },
+                # Unchanged rows are not rewritten
+                where=or_(
+                    LeaderboardSnapshotModel.points != upsert.excluded.points,
+                    LeaderboardSnapshotModel.position != upsert.excluded.position,
+                ),
+            )
+        )
+        await db.execute(
+            delete(LeaderboardSnapshotModel).where(
+                LeaderboardSnapshotModel.period == period,
+                ~exists().where(ranking.c.user_id == LeaderboardSnapshotModel.user_id),
+            )
+        )
+
+        row_count = await db.scalar(
+            select(func.count())
+            .select_from(LeaderboardSnapshotModel)
+            .where(LeaderboardSnapshotModel.period == period)
+        )
+        state_upsert = pg_insert(LeaderboardSnapshotStateModel).values(
+            period=period,
+            source_version=source_version,
+            row_count=row_count,
+            refreshed_at=func.localtimestamp(),
+        )
+        await db.execute(
+            state_upsert.on_conflict_do_update(
+                index_elements=[LeaderboardSnapshotStateModel.period],
+                set_={
+                    "source_version": state_upsert.excluded.source_version,
+                    "row_count": state_upsert.excluded.row_count,
+                    "refreshed_at": state_upsert.excluded.refreshed_at,
+                },
+            )
+        )
+        await db.commit()
+
+
+async def get_leaderboard_from_snapshot(
+    telegram_id: int,
+    days: Optional[int],
+    limit: int,
+    around: Optional[int],
+    cursor: Optional[dict],
+    db: AsyncSession,
+) -> Optional[dict]:
+    """
+    Leaderboard page read from the precomputed snapshot of the period.
+
+    Pages are ranges of stored positions and the caller is looked up by primary
+    key. Returns None when the period has no snapshot or it is older than
+    LEADERBOARD_SNAPSHOT_MAX_AGE, so the caller computes the page live.
+    """
+    period = SNAPSHOT_PERIODS.get(days)
+    if period is None or not LEADERBOARD_SNAPSHOTS_ENABLED:
+        return None
+
+    state = (
+        await db.execute(
+            select(
+                LeaderboardSnapshotStateModel.row_count,
+                func.extract(
+                    "epoch",
+                    func.localtimestamp() - LeaderboardSnapshotStateModel.refreshed_at,
+                ).label("stale_seconds"),
+            ).where(LeaderboardSnapshotStateModel.period == period)
+        )
+    ).first()
+    if state is None or state.stale_seconds > LEADERBOARD_SNAPSHOT_MAX_AGE:
+        return None
+
+    snapshot_rows = select(
+        *LEADERBOARD_COLUMNS,
+        LeaderboardSnapshotModel.points,
+        LeaderboardSnapshotModel.position,
+    ).join(LeaderboardSnapshotModel, LeaderboardSnapshotModel.user_id == UserModel.id)
+
+    current_user = None
+    user_id = await get_user_id_by_tID(db, telegram_id)
+    if user_id is not None:
+        me = (
+            await db.execute(
+                snapshot_rows.where(
+                    LeaderboardSnapshotModel.period == period,
+                    LeaderboardSnapshotModel.user_id == user_id,
+                )
+            )
+        ).first()
+        if me is not None:
+            current_user = leaderboard_entry(me, me.points, me.position, telegram_id)
+        else:
+            # Users without points in the period rank after everyone in the snapshot
+            profiles = await get_leaderboard_profiles(db, [user_id])
+            if user_id in profiles:
+                current_user = leaderboard_entry(
+                    profiles[user_id], 0, state.row_count + 1, telegram_id
+                )
+
+    if cursor is not None and cursor["direction"] == "next":
+        first, last = cursor["position"] + 1, cursor["position"] + limit
+    elif cursor is not None:
+        first, last = cursor["position"] - limit, cursor["position"] - 1
+    elif around is None:
+        first, last = 1, limit
+    elif current_user is None:
+        first, last = 1, 0
+    else:
+        center = min(current_user["position"], state.row_count + 1)
+        first, last = center - around, center + around
+
+    result = await db.execute(
+        snapshot_rows.where(
+            LeaderboardSnapshotModel.period == period,
+            LeaderboardSnapshotModel.position.between(max(first, 1), last),
+        ).order_by(LeaderboardSnapshotModel.position)
     )
-    # Updating user profile and add reward.
-    await db.execute(
+    users_list = [
+        leaderboard_entry(row, row.points, row.position, telegram_id)
+        for row in result.all()
+    ]
+    if around is not None and current_user and current_user["position"] > state.row_count:
+        users_list.append(current_user)
+
+    has_prev = bool(users_list) and users_list[0]["position"] > 1
+    has_next = bool(users_list) and users_list[-1]["position"] < state.row_count
+    return leaderboard_page(
+        users_list,
+        has_prev,
+        has_next,
+        None if cursor is not None else current_user,
+        stale_seconds=float(state.stale_seconds),
+    )
+
+
+async def get_leaderboard_from_index(
+    telegram_id: int, limit: int, around: Optional[int], db: AsyncSession
+):
+    """
+    All-time top or around page answered by the rank index.
+
+    Ranks and points come from memory; only display columns missing from
+    `leaderboard_profile_cache` are read, in one primary-key lookup.
+    """
+    user_id = await get_user_id_by_tID(db, telegram_id)
+    position = rank_index.position(user_id) if user_id else None
+
+    if around is None:
+        window = rank_index.top(limit)
+    else:
+        window = rank_index.around(user_id, around) if position else []
+
+    user_ids = [entry_id for entry_id, _, _ in window]
+    if position is not None:
+        user_ids.append(user_id)
+    profiles = await get_leaderboard_profiles(db, user_ids)
+
+    users_list = [
+        leaderboard_entry(profiles[entry_id], points, entry_position, telegram_id)
+        for entry_id, points, entry_position in window
+        if entry_id in profiles
+    ]
+
+    current_user = None
+    if position is not None and user_id in profiles:
+        current_user = leaderboard_entry(
+            profiles[user_id], rank_index.points(user_id), position, telegram_id
+        )
+
+    has_prev = bool(users_list) and users_list[0]["position"] > 1
+    has_next = bool(users_list) and users_list[-1]["position"] < len(rank_index)
+    return leaderboard_page(users_list, has_prev, has_next, current_user)
+
+
+async def complete_quest_and_take_rewards(
+    user_id: UUID, quest_id: UUID, db: AsyncSession
+):
+    """
+    Credit the rewards of a completed quest to the user, once.
+
+    The claim is a single statement: a data-modifying CTE inserts the
+    user_rewards rows of the quest's rewards (only if the user's progress is
+    TASK_COMPLETED) with ON CONFLICT DO NOTHING on (user_id, reward_id), and
+    the UPDATE of users adds the totals of the inserted rows relatively
+    (`coins = coins + ...`) and returns the new balances. A concurrent claim
+    waits on the unique index and then inserts nothing, so it credits nothing;
+    concurrent edits of the balances are not overwritten. The points change is
+    recorded in the ledger in the same transaction.
+
+    - **db**: Database session dependency.
+    - **user_id**: ID of the user who completed quest.
+    - **quest_id** ID of the completed quest.
+
+    Raises:
+        HTTPException: 404 if the user or the quest's rewards do not exist,
+                       409 if the quest is not completed or the rewards were
+                       already claimed.
+    """
+    quest_completed = exists().where(
+        UserQuestProgressModel.user_id == user_id,
+        UserQuestProgressModel.quest_id == quest_id,
+        UserQuestProgressModel.status == TASK_COMPLETED,
+    )
+    # INSERT ... SELECT skips the Python-side id default, so it is generated here
+    claimed = (
+        pg_insert(UserRewardsModel)
+        .from_select(
+            ["id", "user_id", "reward_id"],
+            select(func.gen_random_uuid(), literal(user_id), RewardModel.id).where(
+                RewardModel.quest_id == quest_id, quest_completed
+            ),
+        )
+        .on_conflict_do_nothing(
+            index_elements=[UserRewardsModel.user_id, UserRewardsModel.reward_id]
+        )
+        .returning(UserRewardsModel.reward_id)
+        .cte("claimed")
+    )
+    totals = (
+        select(
+            func.count().label("rewards"),
+            func.coalesce(func.sum(RewardModel.coins), 0).label("coins"),
+            func.coalesce(func.sum(RewardModel.points), 0).label("points"),
+            func.coalesce(func.sum(RewardModel.level_increase), 0).label("level"),
+        )
+        .select_from(claimed.join(RewardModel, RewardModel.id == claimed.c.reward_id))
+        .subquery("totals")
+    )
+    result = await db.execute(
         update(UserModel)
-        .where(UserModel.id == user_id)
+        .where(UserModel.id == user_id, totals.c.rewards > 0)
         .values(
-            coins=user.coins + reward_result.coins,
-            points=user.points + reward_result.points,
-            level=user.level + reward_result.level_increase,
+            coins=UserModel.coins + totals.c.coins,
+            points=UserModel.points + totals.c.points,
+            level=UserModel.level + totals.c.level,
         )
+        .returning(UserModel, totals.c.coins, totals.c.points, totals.c.level)
+        .execution_options(synchronize_session=False)
     )
-    # Save all changes.
+    row = result.first()
+
+    if row is None:
+        await db.rollback()
+        # Only a refused claim pays for a second query, to pick the error
+        user_exists, completed, has_rewards = (
+            await db.execute(
+                select(
+                    exists().where(UserModel.id == user_id),
+                    quest_completed,
+                    exists().where(RewardModel.quest_id == quest_id),
+                )
+            )
+        ).one()
+        if not user_exists:
+            raise HTTPException(status_code=404, detail="User not found")
+        if not completed:
+            raise HTTPException(status_code=409, detail="Quest not completed yet.")
+        if not has_rewards:
+            raise HTTPException(
+                status_code=404, detail="No reward found for this quest."
+            )
+        raise HTTPException(
+            status_code=409, detail="Reward for this quest has already been claimed"
+        )
+
+    user, coins, points, level = row
+    await record_points_change(db, user_id, points, "quest_reward")
     await db.commit()
+    points_changed(user_id, user.points)
 
     return {
         "message": "Reward successfully claimed",
-        "reward": reward_result.coins,
-        "points": reward_result.points,
-        "level": reward_result.level_increase,
+        "reward": coins,
+        "points": points,
+        "level": level,
         "user": user,
     }
 
@@ -458,6 +1492,8 @@ async def get_reward_by_quest_id(quest_id: UUID, db: AsyncSession):
     - **db**: Database session dependency.
     - **quest_id** ID of the completed quest.
     """
+    if catalog.serving():
+        return catalog.rewards(quest_id) or None
 
     query = select(RewardModel).where(RewardModel.quest_id == quest_id)
     result = await db.execute(query)
@@ -475,7 +1511,7 @@ async def get_initial_quest(db: AsyncSession):
 
     This function queries the database for the initial quest linked to
     a new user. It eagerly loads the related Quest to avoid additional
-    queries.
+    queries, or takes it from the quest catalog once that is loaded.
 
     Args:
         db (AsyncSession): The database session for making queries.
@@ -484,6 +1520,9 @@ async def get_initial_quest(db: AsyncSession):
         Quest or None: Returns the associated Quest object if found,
         otherwise None.
     """
+    if catalog.serving():
+        return catalog.initial_quest()
+
     # Execute a query to select the InitialQuest, eagerly loading the associated Quest
     result = await db.execute(
         select(InitialQuest).options(joinedload(InitialQuest.quest)).limit(1)
@@ -525,8 +1564,10 @@ async def update_quest_fields_in_db(
         if hasattr(quest, field):
             setattr(quest, field, value)
 
+    version = await catalog.bump_version(db)
     await db.commit()
     await db.refresh(quest)
+    await catalog.quest_saved(db, version, quest)
 
     return QuestSchema.from_orm(quest)
 
@@ -558,8 +1599,10 @@ async def update_quest_in_db(
     for field, value in quest_data.dict().items():
         setattr(quest, field, value)
 
+    version = await catalog.bump_version(db)
     await db.commit()
     await db.refresh(quest)
+    await catalog.quest_saved(db, version, quest)
 
     return QuestSchema.from_orm(quest)
 
@@ -580,6 +1623,9 @@ async def delete_quest_in_db(db: AsyncSession, quest: QuestModel):
     """
     # Deleting the quest
     await db.delete(quest)
+    version = await catalog.bump_version(db)
     await db.commit()
+    await catalog.quest_deleted(db, version, quest.id)
+    quest_total_cache.pop(QUEST_TOTAL_KEY)
 
     return {"message": "Quest deleted successfully"}
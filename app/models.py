@@ -7,13 +7,17 @@ from sqlalchemy import (
     Boolean,
     Float,
     DateTime,
+    Date,
     func,
     ForeignKey,
+    Index,
+    Computed,
+    text,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 import uuid
 from uuid import uuid4
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
 from enum import Enum
 
 
@@ -39,7 +43,7 @@ class User(Base):
         default="https://quests-app-bucket.s3.eu-north-1.amazonaws.com/images/ava6.jpg",
     )
     level = Column(Integer, default=0)
-    points = Column(Integer, default=0)
+    points = Column(Integer, default=0, server_default="0", nullable=False)
     coins = Column(Integer, default=0)
     role_id = Column(
         UUID(as_uuid=True), ForeignKey("user_roles.id"), nullable=True
@@ -56,6 +60,32 @@ class User(Base):
     # Relationship to user roles
     role = relationship("UserRoleModel")
 
+    __table_args__ = (
+        # Serves leaderboard ordering, keyset pages and "users ranked above" counts;
+        # the included display columns make leaderboard pages index-only scans
+        Index(
+            "ix_users_leaderboard",
+            "points",
+            "id",
+            postgresql_include=["telegram_id", "first_name", "last_name", "image_url"],
+        ),
+        # Same ordering within each class and role segment
+        Index(
+            "ix_users_leaderboard_class",
+            "user_class",
+            "points",
+            "id",
+            postgresql_include=["telegram_id", "first_name", "last_name", "image_url"],
+        ),
+        Index(
+            "ix_users_leaderboard_role",
+            "role_id",
+            "points",
+            "id",
+            postgresql_include=["telegram_id", "first_name", "last_name", "image_url"],
+        ),
+    )
+
 
 class Quest(Base):
     __tablename__ = "quests"
@@ -70,14 +100,34 @@ class Quest(Base):
     requirements = Column(String, default="")
     required_level = Column(Integer, default=0)
     long_description = Column(String, default="")
-    created_at = Column(DateTime, server_default=func.now())
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
     updated_at = Column(DateTime, onupdate=func.now(), nullable=True)
+    # Full-text search document, kept up to date by Postgres. The `simple`
+    # configuration indexes whole lowercase words, for Ukrainian and English alike
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+                "setweight(to_tsvector('simple', coalesce(type, '')), 'B') || "
+                "setweight(to_tsvector('simple', coalesce(description, '')), 'C') || "
+                "setweight(to_tsvector('simple', coalesce(long_description, '')), 'D')",
+                persisted=True,
+            ),
+        )
+    )
 
     requirements_table = relationship("Requirement", back_populates="quest")
     rewards = relationship("Reward", back_populates="quest")
     quest_progress = relationship("UserQuestProgress", back_populates="quest")
     initial_quest = relationship("InitialQuest", back_populates="quest", uselist=False)
 
+    __table_args__ = (
+        # Quest listings are ordered and paginated by (created_at, id)
+        Index("ix_quests_created_at_id", "created_at", "id"),
+        Index("ix_quests_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
 
 class InitialQuest(Base):
     __tablename__ = "initial_quests"
@@ -137,10 +187,26 @@ class UserQuestProgress(Base):
     is_reward_accepted = Column(Boolean, default=False)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, onupdate=func.now(), nullable=True)
+    submitted_at = Column(DateTime, nullable=True)  # Last move to REVIEW_PENDING
 
     user = relationship("User", back_populates="quest_progress")
     quest = relationship("Quest", back_populates="quest_progress")
 
+    __table_args__ = (
+        # One progress row per user and quest; the ON CONFLICT target of accepting
+        # a quest and the lookup of the quest transitions
+        Index(
+            "ix_user_quest_progress_user_quest", "user_id", "quest_id", unique=True
+        ),
+        # Mentor review queue: pending rows only, in submission order
+        Index(
+            "ix_user_quest_progress_review_queue",
+            "submitted_at",
+            "id",
+            postgresql_where=text("status = 'REVIEW_PENDING'"),
+        ),
+    )
+
 
 class Requirement(Base):
     __tablename__ = "requirements_table"
@@ -184,3 +250,94 @@ class UserRewards(Base):
     received_at = Column(
         DateTime, server_default=func.now(), onupdate=func.now(), nullable=False
     )
+
+    __table_args__ = (
+        # A reward is credited once per user; the ON CONFLICT target of claiming
+        Index("ix_user_rewards_user_reward", "user_id", "reward_id", unique=True),
+    )
+
+
+class PointsLedger(Base):
+    """Append-only log of every change to a user's points."""
+
+    __tablename__ = "points_ledger"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    delta = Column(Integer, nullable=False)
+    source = Column(String, nullable=False)  # "quest_reward", "admin_edit", "profile_edit" or "backfill"
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+
+
+class UserPointsDaily(Base):
+    """Per-user, per-day sums of the points ledger used by time-windowed leaderboards."""
+
+    __tablename__ = "user_points_daily"
+
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    day = Column(Date, primary_key=True)
+    points = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        # Window scans read only the days of the requested period, index-only
+        Index(
+            "ix_user_points_daily_day",
+            "day",
+            postgresql_include=["user_id", "points"],
+        ),
+    )
+
+
+class LeaderboardSnapshot(Base):
+    """Precomputed leaderboard positions of one period, refreshed in the background."""
+
+    __tablename__ = "leaderboard_snapshots"
+
+    period = Column(String, primary_key=True)  # "day", "week", "month" or "allTime"
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    points = Column(Integer, nullable=False)
+    position = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        # Top pages and position windows read consecutive positions of a period
+        Index("ix_leaderboard_snapshots_period_position", "period", "position"),
+    )
+
+
+class LeaderboardSnapshotState(Base):
+    """When each leaderboard snapshot was last refreshed and from which source data."""
+
+    __tablename__ = "leaderboard_snapshot_state"
+
+    period = Column(String, primary_key=True)
+    source_version = Column(String, nullable=False)
+    row_count = Column(Integer, nullable=False)
+    refreshed_at = Column(DateTime, server_default=func.now(), nullable=False)
+
+
+class CatalogState(Base):
+    """
+    Version of the quest catalog, bumped by every quest or reward write so the
+    in-process catalogs of all workers can tell when they are out of date.
+    """
+
+    __tablename__ = "catalog_state"
+
+    id = Column(Integer, primary_key=True)  # Single row, id = 1
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(
+        DateTime, server_default=func.now(), onupdate=func.now(), nullable=False
+    )
@@ -0,0 +1,162 @@
+import re
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+# Searchable quest fields and their weight, as in the quests.search_vector column
+# (ts_rank's default weights for the labels A, B, C and D)
+SEARCH_FIELDS = (
+    ("name", "A", 1.0),
+    ("type", "B", 0.4),
+    ("description", "C", 0.2),
+    ("long_description", "D", 0.1),
+)
+
+# Facet buckets of required_level, (label, lowest, highest or None)
+LEVEL_RANGES = (
+    ("0-2", 0, 2),
+    ("3-5", 3, 5),
+    ("6-9", 6, 9),
+    ("10+", 10, None),
+)
+
+# Endings removed from query words, so that an inflected word still matches the
+# other forms of it by prefix. Postgres ships no Ukrainian dictionary, so both
+# languages are indexed with the `simple` configuration (whole lowercase words).
+UKRAINIAN_ENDINGS = (
+    "ами", "ями", "ові", "еві", "ого", "ому", "ими", "іми",
+    "ах", "ях", "ам", "ям", "ом", "ем", "ів", "их", "ий", "ій", "ою", "ею",
+    "а", "я", "у", "ю", "і", "и", "о", "е", "ь", "й",
+)
+ENGLISH_ENDINGS = ("ing", "ed", "es", "s")
+MIN_STEM_LENGTH = 4
+
+WORD = re.compile(r"[^\W_]+")
+CYRILLIC = re.compile(r"[а-яіїєґ]")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase words of a text, split the way the `simple` configuration splits them."""
+    return WORD.findall(text.lower()) if text else []
+
+
+def search_terms(query: str) -> List[str]:
+    """
+    Prefix terms of a search query: its words without a common inflectional ending.
+    """
+    terms = []
+    for word in tokenize(query):
+        endings = UKRAINIAN_ENDINGS if CYRILLIC.search(word) else ENGLISH_ENDINGS
+        for ending in endings:
+            if word.endswith(ending) and len(word) - len(ending) >= MIN_STEM_LENGTH:
+                word = word[: -len(ending)]
+                break
+        if word not in terms:
+            terms.append(word)
+    return terms
+
+
+def tsquery_text(terms: Iterable[str]) -> str:
+    """`to_tsquery` input matching every term as a prefix."""
+    return " & ".join(f"'{term}':*" for term in terms)
+
+
+def matches_levels(quest, min_level: Optional[int], max_level: Optional[int]) -> bool:
+    return (min_level is None or quest.required_level >= min_level) and (
+        max_level is None or quest.required_level <= max_level
+    )
+
+
+def level_range(level: int) -> Optional[str]:
+    for label, lowest, highest in LEVEL_RANGES:
+        if level >= lowest and (highest is None or level <= highest):
+            return label
+    return None
+
+
+class QuestSearchIndex:
+    """
+    In-memory inverted index of the catalog quests, used when the catalog serves
+    reads; matches the same quests as the `search_vector` column.
+
+    Each word maps to the quests containing it with the weight of the best field
+    it appears in. Prefix terms are looked up in the sorted vocabulary.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[UUID, float]] = {}
+        self._words_by_quest: Dict[UUID, set] = {}
+        self._vocabulary: List[str] = []
+        self._vocabulary_stale = False
+
+    def add(self, quest) -> None:
+        self.remove(quest.id)
+        words = {}
+        for field, _, weight in SEARCH_FIELDS:
+            for word in tokenize(getattr(quest, field)):
+                words[word] = max(words.get(word, 0.0), weight)
+
+        for word, weight in words.items():
+            if word not in self._postings:
+                self._postings[word] = {}
+                self._vocabulary_stale = True
+            self._postings[word][quest.id] = weight
+        self._words_by_quest[quest.id] = set(words)
+
+    def remove(self, quest_id: UUID) -> None:
+        for word in self._words_by_quest.pop(quest_id, ()):
+            postings = self._postings[word]
+            postings.pop(quest_id, None)
+            if not postings:
+                del self._postings[word]
+                self._vocabulary_stale = True
+
+    def search(self, terms: List[str]) -> Dict[UUID, float]:
+        """Score of every quest matching all terms (as prefixes)."""
+        if self._vocabulary_stale:
+            self._vocabulary = sorted(self._postings)
+            self._vocabulary_stale = False
+
+        scores = None
+        for term in terms:
+            term_scores = {}
+            position = bisect_left(self._vocabulary, term)
+            while position < len(self._vocabulary) and self._vocabulary[
+                position
+            ].startswith(term):
+                for quest_id, weight in self._postings[
+                    self._vocabulary[position]
+                ].items():
+                    if weight > term_scores.get(quest_id, 0.0):
+                        term_scores[quest_id] = weight
+                position += 1
+
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {
+                    quest_id: score + term_scores[quest_id]
+                    for quest_id, score in scores.items()
+                    if quest_id in term_scores
+                }
+            if not scores:
+                return {}
+        return scores or {}
+
+
+def facet_counts(
+    quests: Iterable, types: Optional[List[str]], min_level, max_level
+) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """
+    Counts per type and per required_level range of the matching quests. Each
+    facet is counted with the other facet's filter applied but not its own, so
+    the counts show what selecting another value would return.
+    """
+    by_type, by_level = {}, {}
+    for quest in quests:
+        if matches_levels(quest, min_level, max_level):
+            by_type[quest.type] = by_type.get(quest.type, 0) + 1
+        label = level_range(quest.required_level)
+        if label is not None and (not types or quest.type in types):
+            by_level[label] = by_level.get(label, 0) + 1
+    return by_type, by_level
@@ -0,0 +1,217 @@
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import (
+    String,
+    column,
+    exists,
+    func,
+    select,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import UserQuestProgress as UserQuestProgressModel
+
+# Statuses of a user's quest progress row
+ACTIVE = "active"  # Assigned at registration
+BLOCKED = "blocked"  # Assigned at registration, still locked
+IN_PROGRESS = "IN_PROGRESS"
+REVIEW_PENDING = "REVIEW_PENDING"
+CHANGES_REQUESTED = "CHANGES_REQUESTED"
+TASK_COMPLETED = "TASK_COMPLETED"
+
+
+class Transition(NamedTuple):
+    """A move of a progress row: the statuses it starts from and what it sets."""
+
+    from_statuses: Tuple[str, ...]
+    values: dict
+    error: str  # Detail of the 400 returned when the row is in another status
+
+
+QUEST_TRANSITIONS = {
+    "submit": Transition(
+        (ACTIVE, BLOCKED, IN_PROGRESS, CHANGES_REQUESTED),
+        {"status": REVIEW_PENDING, "submitted_at": func.now()},
+        "Quest is already submitted for review or completed",
+    ),
+    "request_changes": Transition(
+        (REVIEW_PENDING,),
+        {"status": CHANGES_REQUESTED},
+        "Quest is not in a reviewable state for requesting changes",
+    ),
+    "complete": Transition(
+        (REVIEW_PENDING,),
+        {"status": TASK_COMPLETED},
+        "Quest is not in a reviewable state for completion",
+    ),
+    "accept_reward": Transition(
+        (TASK_COMPLETED,),
+        {"is_reward_accepted": True},
+        "Quest is not in a accept reward state",
+    ),
+}
+
+
+async def transition_quest_progress(
+    db: AsyncSession, user_id: UUID, quest_id: UUID, move: str, **changes
+) -> UserQuestProgressModel:
+    """
+    Apply a move of QUEST_TRANSITIONS to the user's progress on a quest.
+
+    The status check and the write are one conditional UPDATE ... RETURNING, so
+    concurrent moves of the same row cannot both pass the check: the second one
+    re-evaluates the condition after the first commits and matches no row.
+
+    - **changes**: Additional columns to set, e.g. the mentor comment.
+
+    Raises:
+        HTTPException: 404 if the user has no progress on the quest, 400 with
+                       the move's error if the progress is in another status.
+
+    Returns the updated progress row.
+    """
+    transition = QUEST_TRANSITIONS[move]
+    result = await db.execute(
+        update(UserQuestProgressModel)
+        .where(
+            UserQuestProgressModel.user_id == user_id,
+            UserQuestProgressModel.quest_id == quest_id,
+            UserQuestProgressModel.status.in_(transition.from_statuses),
+        )
+        .values(**transition.values, **changes)
+        .returning(UserQuestProgressModel)
+    )
+    progress = result.scalars().one_or_none()
+
+    if progress is None:
+        await db.rollback()
+        # Only a refused move pays for a second query, to pick the error
+        has_progress = await db.scalar(
+            select(
+                exists().where(
+                    UserQuestProgressModel.user_id == user_id,
+                    UserQuestProgressModel.quest_id == quest_id,
+                )
+            )
+        )
+        if not has_progress:
+            raise HTTPException(
+                status_code=404, detail="Quest progress not found for this user"
+            )
+        raise HTTPException(status_code=400, detail=transition.error)
+
+    await db.commit()
+    return progress
+
+
+# Moves a mentor can apply to many submissions at once
+REVIEW_MOVES = ("complete", "request_changes")
+
+
+async def review_quest_progress(
+    db: AsyncSession, decisions: Iterable[Tuple[UUID, str, Optional[str]]]
+) -> Dict[UUID, UserQuestProgressModel]:
+    """
+    Apply mentor decisions to many progress rows in one
+    UPDATE ... FROM (VALUES ...) RETURNING.
+
+    - **decisions**: (progress id, move of REVIEW_MOVES, mentor comment or None
+      to keep the current one); the last decision of a repeated id wins.
+
+    Rows that are missing or no longer REVIEW_PENDING (e.g. reviewed by
+    another mentor in the meantime) match nothing and are left out of the
+    result instead of failing the batch.
+
+    Returns the updated progress rows by id.
+    """
+    rows = {
+        progress_id: (
+            progress_id,
+            QUEST_TRANSITIONS[move].values["status"],
+            mentor_comment,
+        )
+        for progress_id, move, mentor_comment in decisions
+    }
+    if not rows:
+        return {}
+
+    decided = values(
+        column("id", PG_UUID(as_uuid=True)),
+        column("status", String),
+        column("mentor_comment", String),
+        name="decisions",
+    ).data(list(rows.values()))
+    result = await db.execute(
+        update(UserQuestProgressModel)
+        .where(
+            UserQuestProgressModel.id == decided.c.id,
+            # Both review moves start from REVIEW_PENDING
+            UserQuestProgressModel.status.in_(
+                QUEST_TRANSITIONS["complete"].from_statuses
+            ),
+        )
+        .values(
+            status=decided.c.status,
+            mentor_comment=func.coalesce(
+                decided.c.mentor_comment, UserQuestProgressModel.mentor_comment
+            ),
+        )
+        .returning(UserQuestProgressModel)
+    )
+    updated = {progress.id: progress for progress in result.scalars().all()}
+    await db.commit()
+    return updated
+
+
+async def start_quest(
+    db: AsyncSession, user_id: UUID, quest_id: UUID
+) -> UserQuestProgressModel:
+    """
+    Create the user's progress on a quest in IN_PROGRESS, as one
+    INSERT ... ON CONFLICT DO NOTHING RETURNING.
+
+    The unique (user_id, quest_id) index makes concurrent accepts of the same
+    quest insert a single row, and the quest_id foreign key rejects unknown
+    quests, so nothing is read beforehand.
+
+    Raises:
+        HTTPException: 404 if the quest does not exist, 400 if the user has
+                       already accepted it.
+
+    Returns the new progress row.
+    """
+    try:
+        result = await db.execute(
+            pg_insert(UserQuestProgressModel)
+            .values(user_id=user_id, quest_id=quest_id, status=IN_PROGRESS)
+            .on_conflict_do_nothing(
+                index_elements=[
+                    UserQuestProgressModel.user_id,
+                    UserQuestProgressModel.quest_id,
+                ]
+            )
+            .returning(UserQuestProgressModel)
+        )
+    except IntegrityError:
+        # quest_id violates the foreign key to quests
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Quest not found"
+        )
+
+    progress = result.scalars().one_or_none()
+    if progress is None:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="User has already accepted this quest",
+        )
+
+    await db.commit()
+    return progress
@@ -0,0 +1,369 @@
+import asyncio
+import os
+from array import array
+from typing import Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import select
+
+from app.models import User as UserModel
+
+
+class RankIndex:
+    """
+    In-process order-statistics index of users ordered by (points, id) descending.
+
+    Users are kept in sorted blocks of parallel arrays (points, high 64 bits of the
+    id, slot), with a Fenwick tree over the block sizes. Finding, inserting or
+    removing a user costs O(log n) comparisons plus a memmove inside one block,
+    and a position is a Fenwick prefix sum. There are no per-node Python objects:
+    each user costs a few array items plus one dict entry mapping its id to a slot.
+
+    The ordering matches the SQL leaderboard (`ORDER BY points DESC, id DESC`),
+    so positions are 1 + the number of users ranked above.
+
+    Args:
+        block_size (int): Target block length; blocks are split at twice this size.
+    """
+
+    def __init__(self, block_size: int = 512):
+        self.block_size = block_size
+        self.ready = False  # Becomes True after the first load from the database
+        self._reloading = False
+        self._pending = []  # Changes made while a reload is streaming users
+        self._slot_by_id = {}
+        self._ids = bytearray()  # 16 bytes of UUID per slot
+        self._points = array("q")  # Current points per slot
+        self._free_slots = []
+        self._block_points = []  # Per block: array("q") of points, descending
+        self._block_ties = []  # Per block: array("Q") of the ids' high 64 bits
+        self._block_slots = []  # Per block: array("L") of slots
+        self._tree = array("q", [0])  # Fenwick tree of block sizes
+
+    def __len__(self) -> int:
+        return len(self._slot_by_id)
+
+    # Public API
+
+    def update(self, user_id: UUID, points: int) -> None:
+        """Insert a user or move them to their new points."""
+        if self._reloading:
+            self._pending.append((user_id, points))
+        elif not self.ready:
+            return  # Not loaded (or disabled); the first load reads current points
+
+        slot = self._slot_by_id.get(user_id)
+        if slot is None:
+            slot = self._allocate_slot(user_id, points)
+        elif self._points[slot] == points:
+            return
+        else:
+            self._remove_slot(slot)
+            self._points[slot] = points
+
+        self._insert_slot(slot)
+
+    def remove(self, user_id: UUID) -> None:
+        if self._reloading:
+            self._pending.append((user_id, None))
+        elif not self.ready:
+            return
+
+        slot = self._slot_by_id.pop(user_id, None)
+        if slot is not None:
+            self._remove_slot(slot)
+            self._free_slots.append(slot)
+
+    def position(self, user_id: UUID) -> Optional[int]:
+        """1-based leaderboard position of the user, None if unknown."""
+        slot = self._slot_by_id.get(user_id)
+        if slot is None:
+            return None
+        block, offset = self._find(slot)
+        return self._blocks_before(block) + offset + 1
+
+    def points(self, user_id: UUID) -> Optional[int]:
+        slot = self._slot_by_id.get(user_id)
+        return None if slot is None else self._points[slot]
+
+    def top(self, limit: int) -> List[Tuple[UUID, int, int]]:
+        """The first `limit` users as (user_id, points, position)."""
+        return self._walk(0, 0, limit, 1)
+
+    def around(self, user_id: UUID, count: int) -> List[Tuple[UUID, int, int]]:
+        """
+        The user with up to `count` users above and below them,
+        as (user_id, points, position) in leaderboard order.
+        """
+        slot = self._slot_by_id.get(user_id)
+        if slot is None:
+            return []
+
+        block, offset = self._find(slot)
+        rank = self._blocks_before(block) + offset
+        first = max(rank - count, 0)
+        start_block, start_offset = self._block_at(first)
+        return self._walk(start_block, start_offset, rank - first + count + 1, first + 1)
+
+    def stats(self) -> dict:
+        array_bytes = sum(
+            a.itemsize * len(a)
+            for arrays in (self._block_points, self._block_ties, self._block_slots)
+            for a in arrays
+        )
+        return {
+            "ready": self.ready,
+            "users": len(self),
+            "blocks": len(self._block_points),
+            "arrayBytes": array_bytes
+            + len(self._ids)
+            + self._points.itemsize * len(self._points),
+        }
+
+    # Loading and reconciliation
+
+    def load_sorted(self, rows: Iterable[Tuple[UUID, int]]) -> None:
+        """
+        Replace the content with users given in leaderboard order
+        ((points, id) descending), filling blocks sequentially.
+        """
+        fresh = RankIndex(self.block_size)
+        for user_id, points in rows:
+            fresh._append(user_id, points)
+        self._adopt(fresh)
+
+    async def load(self, session_factory) -> None:
+        """
+        Reload the index from the users table.
+
+        Changes applied while the users are streamed are replayed on top of the
+        freshly loaded data, so no update is lost during a reconciliation.
+        """
+        self._reloading = True
+        self._pending = []
+        try:
+            fresh = RankIndex(self.block_size)
+            async with session_factory() as db:
+                result = await db.stream(
+                    select(UserModel.id, UserModel.points)
+                    .order_by(UserModel.points.desc(), UserModel.id.desc())
+                    .execution_options(yield_per=10000)
+                )
+                async for row in result:
+                    fresh._append(row.id, row.points)
+
+            pending, self._pending = self._pending, []
+            self._reloading = False
+            self._adopt(fresh)
+
+            for user_id, points in pending:
+                if points is None:
+                    self.remove(user_id)
+                else:
+                    self.update(user_id, points)
+        finally:
+            self._reloading = False
+
+    async def reconcile_forever(self, session_factory, interval: float) -> None:
+        """Load the index, then reload it every `interval` seconds."""
+        while True:
+            try:
+                await self.load(session_factory)
+            except Exception as err:
+                print(f"Rank index reconciliation failed: {err}")
+            await asyncio.sleep(interval)
+
+    # Internals
+
+    def _append(self, user_id: UUID, points: int) -> None:
+        """Add a user ranked below every user already present (bulk loading)."""
+        slot = self._allocate_slot(user_id, points)
+        if (
+            not self._block_points
+            or len(self._block_points[-1]) == self.block_size
+        ):
+            self._block_points.append(array("q"))
+            self._block_ties.append(array("Q"))
+            self._block_slots.append(array("L"))
+        self._block_points[-1].append(points)
+        self._block_ties[-1].append(user_id.int >> 64)
+        self._block_slots[-1].append(slot)
+
+    def _adopt(self, other: "RankIndex") -> None:
+        """Swap in the content of a freshly built index."""
+        other._rebuild_tree()
+        for name in (
+            "_slot_by_id",
+            "_ids",
+            "_points",
+            "_free_slots",
+            "_block_points",
+            "_block_ties",
+            "_block_slots",
+            "_tree",
+        ):
+            setattr(self, name, getattr(other, name))
+        self.ready = True
+
+    def _allocate_slot(self, user_id: UUID, points: int) -> int:
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self._ids[slot * 16 : slot * 16 + 16] = user_id.bytes
+            self._points[slot] = points
+        else:
+            slot = len(self._points)
+            self._ids += user_id.bytes
+            self._points.append(points)
+        self._slot_by_id[user_id] = slot
+        return slot
+
+    def _user_id(self, slot: int) -> UUID:
+        return UUID(bytes=bytes(self._ids[slot * 16 : slot * 16 + 16]))
+
+    def _low_bits(self, slot: int) -> int:
+        return int.from_bytes(self._ids[slot * 16 + 8 : slot * 16 + 16], "big")
+
+    def _compare(self, block: int, offset: int, points: int, tie: int, slot: int):
+        """Compare the entry at (block, offset) with a key: 1 above, 0 same, -1 below."""
+        entry_points = self._block_points[block][offset]
+        if entry_points != points:
+            return 1 if entry_points > points else -1
+        entry_tie = self._block_ties[block][offset]
+        if entry_tie != tie:
+            return 1 if entry_tie > tie else -1
+        # Same high 64 bits, fall back to the rest of the ids
+        entry_low = self._low_bits(self._block_slots[block][offset])
+        low = self._low_bits(slot)
+        if entry_low != low:
+            return 1 if entry_low > low else -1
+        return 0
+
+    def _locate(self, slot: int) -> Tuple[int, int]:
+        """Block and offset where the slot's key is, or should be inserted."""
+        points = self._points[slot]
+        tie = int.from_bytes(self._ids[slot * 16 : slot * 16 + 8], "big")
+
+        # Last block whose first (largest) entry is not below the key
+        lo, hi = 0, len(self._block_points)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._compare(mid, 0, points, tie, slot) >= 0:
+                lo = mid + 1
+            else:
+                hi = mid
+        block = max(lo - 1, 0)
+
+        # First entry of the block that is not above the key
+        lo, hi = 0, len(self._block_points[block])
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._compare(block, mid, points, tie, slot) > 0:
+                lo = mid + 1
+            else:
+                hi = mid
+        return block, lo
+
+    def _find(self, slot: int) -> Tuple[int, int]:
+        block, offset = self._locate(slot)
+        if (
+            offset >= len(self._block_slots[block])
+            or self._block_slots[block][offset] != slot
+        ):
+            raise KeyError(slot)
+        return block, offset
+
+    def _insert_slot(self, slot: int) -> None:
+        tie = int.from_bytes(self._ids[slot * 16 : slot * 16 + 8], "big")
+        if not self._block_points:
+            self._block_points.append(array("q", [self._points[slot]]))
+            self._block_ties.append(array("Q", [tie]))
+            self._block_slots.append(array("L", [slot]))
+            self._rebuild_tree()
+            return
+
+        block, offset = self._locate(slot)
+        self._block_points[block].insert(offset, self._points[slot])
+        self._block_ties[block].insert(offset, tie)
+        self._block_slots[block].insert(offset, slot)
+
+        if len(self._block_points[block]) > 2 * self.block_size:
+            self._split(block)
+        else:
+            self._tree_add(block, 1)
+
+    def _remove_slot(self, slot: int) -> None:
+        block, offset = self._find(slot)
+        del self._block_points[block][offset]
+        del self._block_ties[block][offset]
+        del self._block_slots[block][offset]
+
+        if not self._block_points[block]:
+            del self._block_points[block]
+            del self._block_ties[block]
+            del self._block_slots[block]
+            self._rebuild_tree()
+        else:
+            self._tree_add(block, -1)
+
+    def _split(self, block: int) -> None:
+        half = len(self._block_points[block]) // 2
+        for blocks in (self._block_points, self._block_ties, self._block_slots):
+            blocks.insert(block + 1, blocks[block][half:])
+            del blocks[block][half:]
+        self._rebuild_tree()
+
+    def _rebuild_tree(self) -> None:
+        sizes = [len(block) for block in self._block_points]
+        tree = array("q", [0]) + array("q", sizes)
+        for index in range(1, len(tree)):
+            parent = index + (index & -index)
+            if parent < len(tree):
+                tree[parent] += tree[index]
+        self._tree = tree
+
+    def _tree_add(self, block: int, delta: int) -> None:
+        index = block + 1
+        while index < len(self._tree):
+            self._tree[index] += delta
+            index += index & -index
+
+    def _blocks_before(self, block: int) -> int:
+        """Number of users in the blocks before `block`."""
+        total = 0
+        index = block
+        while index > 0:
+            total += self._tree[index]
+            index -= index & -index
+        return total
+
+    def _block_at(self, position: int) -> Tuple[int, int]:
+        """Block and offset of a 0-based position (Fenwick tree descent)."""
+        block = 0
+        step = 1 << (len(self._tree) - 1).bit_length()
+        while step:
+            candidate = block + step
+            if candidate < len(self._tree) and self._tree[candidate] <= position:
+                block = candidate
+                position -= self._tree[candidate]
+            step >>= 1
+        return block, position
+
+    def _walk(self, block: int, offset: int, limit: int, position: int) -> list:
+        entries = []
+        while block < len(self._block_slots) and len(entries) < limit:
+            slots = self._block_slots[block]
+            points = self._block_points[block]
+            while offset < len(slots) and len(entries) < limit:
+                entries.append((self._user_id(slots[offset]), points[offset], position))
+                position += 1
+                offset += 1
+            block += 1
+            offset = 0
+        return entries
+
+
+rank_index = RankIndex()
+
+# Seconds between full reloads of the index from the users table
+RANK_INDEX_RECONCILE_SECONDS = float(os.getenv("RANK_INDEX_RECONCILE_SECONDS", "300"))
+RANK_INDEX_ENABLED = os.getenv("RANK_INDEX_ENABLED", "true").lower() == "true"
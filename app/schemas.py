@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field, HttpUrl
-from typing import Optional, List
+from pydantic import BaseModel, Field, HttpUrl, TypeAdapter
+from typing import ClassVar, Optional, List, Dict, Literal
 from uuid import UUID
 from datetime import datetime
 
@@ -101,7 +101,35 @@ class QuestUpdateResponse(QuestBase):
 class QuestsResponse(BaseModel):
     message: str
     quests: List[Quest]
-    total: int  # Total number of quests available
+    total: Optional[int] = None  # Total number of quests available, None when not requested
+    total_estimated: bool = Field(
+        False, alias="totalEstimated", description="Whether total is a planner estimate"
+    )
+    next_cursor: Optional[str] = Field(
+        None, alias="nextCursor", description="Cursor of the next page, null on the last page"
+    )
+
+    class Config:
+        populate_by_name = True  # Allow using field names for population
+
+
+class QuestSearchResponse(BaseModel):
+    message: str
+    quests: List[Quest]
+    total: int  # Number of quests matching the search and filters
+    facets: Dict[str, Dict[str, int]] = Field(
+        ..., description="Matching quests per type and per requiredLevel range"
+    )
+
+
+class QuestBatchRequest(BaseModel):
+    ids: List[UUID] = Field(..., max_length=500)
+
+
+class QuestBatchResponse(BaseModel):
+    message: str
+    quests: List[Quest]  # Found quests, in the requested order
+    missing: List[UUID]  # Requested ids that match no quest
 
 
 class InitialQuestResponse(BaseModel):
@@ -136,6 +164,8 @@ class RewardBase(BaseModel):
 class Reward(RewardBase):
     id: UUID
     quest_id: UUID
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
@@ -180,10 +210,106 @@ class UserQuestProgressResponse(UserQuestProgressBase):
         populate_by_name = True  # Allow using field names for population
 
 
+class QuestProgressItem(BaseModel):
+    """
+    Compact progress row of `GET /quests/quests_progress`, keeping the
+    snake_case keys the route has always returned.
+    """
+
+    id: UUID
+    quest_id: UUID
+    status: str
+    # Nullable columns, sent as null like the full rows were
+    progress: Optional[float] = None
+    is_locked: Optional[bool] = None
+    mentor_comment: Optional[str] = None
+    is_reward_accepted: Optional[bool] = None
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None  # Last change, to pass as `since` later
+
+    class Config:
+        from_attributes = True
+
+
+# Built once: validates the selected rows and serializes the map straight to JSON
+QuestProgressMap = TypeAdapter(Dict[UUID, QuestProgressItem])
+
+
+class QuestDetail(Quest):
+    """Quest screen bundle: the quest, its rewards and requirements and the caller's progress."""
+
+    rewards: List[Reward]
+    # `requirements` is the quest's requirements text, these are the Requirement rows
+    requirement_items: List[Requirement] = Field(..., alias="requirementItems")
+    progress: Optional[UserQuestProgressResponse] = None
+
+
 class UserQuestProgressChangesRequest(BaseModel):
     mentor_comment: str
 
 
+class ReviewQueueItem(UserQuestProgressResponse):
+    submitted_at: datetime = Field(..., alias="submittedAt")
+
+
+class ReviewDecision(BaseModel):
+    id: UUID  # Progress row, as listed by the review queue
+    action: Literal["complete", "request_changes"]
+    mentor_comment: Optional[str] = Field(None, alias="mentorComment")
+
+    class Config:
+        populate_by_name = True  # Allow using field names for population
+
+
+class ReviewBatchRequest(BaseModel):
+    decisions: List[ReviewDecision] = Field(..., max_length=500)
+
+
+class ReviewResult(BaseModel):
+    id: UUID
+    applied: bool  # False when the row is missing or no longer REVIEW_PENDING
+    progress: Optional[UserQuestProgressResponse] = None  # Updated row when applied
+
+
+class ReviewBatchResponse(BaseModel):
+    message: str
+    results: List[ReviewResult]  # One per requested id, in the requested order
+    applied: int
+    skipped: int
+
+
+class ReviewQueueUser(BaseModel):
+    id: UUID
+    first_name: str = Field(..., alias="firstName")
+    last_name: str = Field(..., alias="lastName")
+    username: Optional[str] = None
+    user_class: Optional[str] = Field(None, alias="userClass")
+    image_url: Optional[str] = Field(None, alias="imageUrl")
+
+    class Config:
+        from_attributes = True
+        populate_by_name = True  # Allow using field names for population
+
+
+class ReviewQueueResponse(BaseModel):
+    """
+    Page of submissions waiting for review, oldest first. Items reference the
+    submitting user and the quest by id; each is listed once in `users`/`quests`.
+    """
+
+    message: str
+    items: List[ReviewQueueItem]
+    users: Dict[UUID, ReviewQueueUser] = {}  # Users referenced by items
+    quests: Dict[UUID, Quest] = {}  # Quests referenced by items
+    next_cursor: Optional[str] = Field(
+        None, alias="nextCursor", description="Cursor of the next page, null on the last page"
+    )
+
+    class Config:
+        populate_by_name = True  # Allow using field names for population
+
+
 # Achievement schema
 class AchievementBase(BaseModel):
     name: str
@@ -293,3 +419,50 @@ class UserResponse(BaseModel):
     class Config:
         from_attributes = True  # Enables Pydantic to work with ORM objects directly
         populate_by_name = True  # Allow using field names for population
+
+
+class NormalizedUserResponse(BaseModel):
+    """
+    Normalized profile: `user.userQuests` and `user.userAchievements` reference
+    quests and achievements by id, and each of them is listed once in `quests`
+    and `achievements`.
+    """
+
+    message: Optional[str] = None
+    user: User
+    quests: Dict[UUID, Quest] = {}  # Quests referenced by user.userQuests
+    achievements: Dict[UUID, Achievement] = {}  # Referenced by user.userAchievements
+
+    class Config:
+        from_attributes = True
+        populate_by_name = True  # Allow using field names for population
+
+    # Nested objects left out of the serialized user, they are sent in quests/achievements
+    reference_exclude: ClassVar[dict] = {
+        "user": {
+            "quest_progress": {"__all__": {"quest"}},
+            "achievements": {"__all__": {"achievement"}},
+        }
+    }
+
+    @classmethod
+    def from_user(cls, user: User, message: Optional[str] = None):
+        """
+        Build the normalized form of an already validated nested `User` profile.
+        """
+        quests = {
+            progress.quest_id: progress.quest
+            for progress in user.quest_progress
+            if progress.quest is not None
+        }
+        achievements = {
+            item.achievement_id: item.achievement
+            for item in user.achievements
+            if item.achievement is not None
+        }
+        return cls.model_construct(
+            message=message, user=user, quests=quests, achievements=achievements
+        )
+
+    def to_json(self) -> str:
+        return self.model_dump_json(by_alias=True, exclude=self.reference_exclude)
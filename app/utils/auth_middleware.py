@@ -1,16 +1,41 @@
 import hmac
 import hashlib
+import time
 import urllib.parse
 import json
-from fastapi import HTTPException, Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from functools import lru_cache
+from typing import Optional, Tuple
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from dotenv import load_dotenv  # For loading environment variables from .env file
 import os  # For accessing environment variables
 
+from app.utils.cache import LRUCache
+from app.utils.identity import TelegramIdentity, parse_identity
+
 # Load environment variables from .env file
 load_dotenv()
 
+# Verified initData is reused for the whole mini-app session, so keep a bounded
+# cache of already validated payloads keyed by their Telegram hash
+INIT_DATA_CACHE_SIZE = int(os.getenv("INIT_DATA_CACHE_SIZE", "10000"))
+INIT_DATA_CACHE_TTL = float(os.getenv("INIT_DATA_CACHE_TTL", "3600"))
+# Cached entries never outlive auth_date + INIT_DATA_MAX_AGE
+INIT_DATA_MAX_AGE = int(os.getenv("INIT_DATA_MAX_AGE", "86400"))
+
+init_data_cache = LRUCache(maxsize=INIT_DATA_CACHE_SIZE, ttl=INIT_DATA_CACHE_TTL)
+
+
+@lru_cache(maxsize=4)
+def get_secret_key(bot_token: str) -> bytes:
+    """
+    Derive the WebAppData secret key for the bot token (once per process).
+    """
+    return hmac.new("WebAppData".encode(), bot_token.encode(), hashlib.sha256).digest()
+
 
 def validate_init_data(init_data_raw: str, bot_token: str) -> dict:
     """
@@ -36,10 +61,8 @@ def validate_init_data(init_data_raw: str, bot_token: str) -> dict:
         f"{key}={value}" for key, value in sorted(params.items()) if key != "hash"
     )
 
-    # Create the secret key with HMAC
-    secret_key = hmac.new(
-        "WebAppData".encode(), bot_token.encode(), hashlib.sha256
-    ).digest()
+    # The secret key only depends on the bot token and is derived once
+    secret_key = get_secret_key(bot_token)
 
     # Generate the HMAC hash for validation
     calculated_hash = hmac.new(
@@ -47,7 +70,7 @@ def validate_init_data(init_data_raw: str, bot_token: str) -> dict:
     ).hexdigest()
 
     # Compare the calculated hash with the provided hash
-    if calculated_hash != params.get("hash", ""):
+    if not hmac.compare_digest(calculated_hash, params.get("hash", "")):
         raise HTTPException(status_code=400, detail="Invalid hash")
 
     # Uncomment if needed to validate auth_date for outdated data
@@ -59,39 +82,138 @@ def validate_init_data(init_data_raw: str, bot_token: str) -> dict:
     return params
 
 
-class AuthMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        # Exclude all paths starting with /docs and /openapi.json from the authorization check
-        if (
-            request.url.path.startswith("/docs")
-            or request.url.path == "/openapi.json"
-            or request.url.path == "/health"
-            or request.url.path == "/favicon.ico"
-        ):
-            # Directly proceed without checking authorization
-            return await call_next(request)
-
-        # Extract Authorization header
-        auth_header = request.headers.get("Authorization")
-        if not auth_header or not auth_header.startswith("tma "):
-            raise HTTPException(
-                status_code=400,
-                detail="Authorization header missing or improperly formatted",
-            )
+def _extract_hash(init_data_raw: str) -> Optional[str]:
+    """
+    Return the 'hash' value of the raw initData without parsing the rest of it.
+    """
+    for part in init_data_raw.split("&"):
+        if part.startswith("hash="):
+            return part[len("hash=") :]
+    return None
+
+
+def _cache_expiry(params: dict) -> Optional[float]:
+    """
+    Compute the monotonic expiry of a verified payload from its auth_date.
+
+    Returns None when the payload should not be cached at all.
+    """
+    try:
+        auth_date = int(params["auth_date"])
+    except (KeyError, ValueError):
+        return None
+
+    remaining = auth_date + INIT_DATA_MAX_AGE - time.time()
+    if remaining <= 0:
+        return None
+
+    return time.monotonic() + min(remaining, INIT_DATA_CACHE_TTL)
+
+
+def verify_init_data(
+    init_data_raw: str, bot_token: str
+) -> Tuple[dict, Optional[TelegramIdentity]]:
+    """
+    Validate initData and decode its user, reusing the result of a previous
+    validation if the exact same payload was already verified and has not
+    expired yet.
+    """
+    provided_hash = _extract_hash(init_data_raw)
+
+    if provided_hash:
+        cached = init_data_cache.get(provided_hash)
+        # The hash is only a lookup key, the whole payload must match as well
+        if cached is not None and cached[0] == init_data_raw:
+            return cached[1], cached[2]
 
-        # Extract initDataRaw from the header (after "tma ")
-        init_data_raw = auth_header[len("tma ") :]
+    params = validate_init_data(init_data_raw, bot_token)
+    # The user payload is decoded here once and shared by every dependency
+    identity = parse_identity(params)
 
-        # Access environment variables using os.getenv
-        bot_token = os.getenv(
-            "BOT_TOKEN"
-        )  # Retrieve the bot token from environment variables
-        # Validate the initial data (replace `bot_token` with your actual bot token or configuration)
-        params = validate_init_data(init_data_raw, bot_token)
+    expires_at = _cache_expiry(params)
+    if expires_at is not None:
+        init_data_cache.set(
+            params["hash"], (init_data_raw, params, identity), expires_at
+        )
+
+    return params, identity
+
+
+# Paths that are served without the Telegram authorization check
+EXCLUDED_PATHS = ("/openapi.json", "/health", "/favicon.ico")
+EXCLUDED_PREFIXES = ("/docs",)
+
+
+def is_excluded_path(path: str) -> bool:
+    return path in EXCLUDED_PATHS or path.startswith(EXCLUDED_PREFIXES)
+
+
+def authenticate(
+    auth_header: Optional[str],
+) -> Tuple[dict, Optional[TelegramIdentity]]:
+    """
+    Verify the 'tma <initData>' Authorization header.
+
+    Returns the validated params together with the decoded Telegram identity.
+
+    Raises:
+        HTTPException: Raises a 400 error if the header is missing, malformed
+                       or carries initData with an invalid hash.
+    """
+    if not auth_header or not auth_header.startswith("tma "):
+        raise HTTPException(
+            status_code=400,
+            detail="Authorization header missing or improperly formatted",
+        )
+
+    # Extract initDataRaw from the header (after "tma ")
+    init_data_raw = auth_header[len("tma ") :]
+
+    # Access environment variables using os.getenv
+    bot_token = os.getenv(
+        "BOT_TOKEN"
+    )  # Retrieve the bot token from environment variables
+
+    try:
+        return verify_init_data(init_data_raw, bot_token)
+    except ValueError:
+        # Raised when initData is not a valid query string
+        raise HTTPException(status_code=400, detail="Invalid init data format")
+
+
+class AuthMiddleware:
+    """
+    Pure ASGI authentication layer.
+
+    Verified initData and the decoded Telegram identity are stored in the
+    request scope state, so routes read them as `request.state.validated_params`
+    and `request.state.identity`. Rejected requests are answered
+    directly with a JSON error, and the response body of accepted requests is
+    passed through untouched.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or is_excluded_path(scope["path"]):
+            # Directly proceed without checking authorization
+            await self.app(scope, receive, send)
+            return
+
+        auth_header = Headers(scope=scope).get("Authorization")
+        try:
+            params, identity = authenticate(auth_header)
+        except HTTPException as exc:
+            response = JSONResponse(
+                status_code=exc.status_code, content={"detail": exc.detail}
+            )
+            await response(scope, receive, send)
+            return
 
-        # Add validated params to the request state for later use
-        request.state.validated_params = params
+        # Add validated params and the identity to the request state for later use
+        state = scope.setdefault("state", {})
+        state["validated_params"] = params
+        state["identity"] = identity
 
-        # Continue processing the request
-        response = await call_next(request)
-        return response
+        await self.app(scope, receive, send)
@@ -0,0 +1,32 @@
+import base64
+import json
+
+from fastapi import HTTPException
+
+
+def encode_cursor(values: dict) -> str:
+    """
+    Encode a keyset position into an opaque, URL-safe cursor string.
+    """
+    payload = json.dumps(values, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *keys: str) -> dict:
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    Raises:
+        HTTPException: Raises a 400 error if the cursor is malformed or
+                       lacks one of the expected keys.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if not isinstance(values, dict) or any(key not in values for key in keys):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    return values
@@ -0,0 +1,69 @@
+import json
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import HTTPException, Request
+
+
+@dataclass(frozen=True, slots=True)
+class TelegramIdentity:
+    """
+    Telegram user verified by the auth layer, decoded once per initData payload.
+    """
+
+    telegram_id: int
+    first_name: str
+    last_name: Optional[str] = None
+    username: Optional[str] = None
+    language_code: Optional[str] = None
+
+
+def parse_identity(params: dict) -> Optional[TelegramIdentity]:
+    """
+    Decode the 'user' field of validated initData params.
+
+    Returns None when the payload carries no user (e.g. chat-only initData).
+
+    Raises:
+        HTTPException: Raises a 400 error if the user data is not valid JSON
+                       or does not contain the Telegram user ID.
+    """
+    user_data_str = params.get("user")
+    if not user_data_str:
+        return None
+
+    try:
+        user_data = json.loads(user_data_str)
+    except json.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="Invalid user data format")
+
+    if not isinstance(user_data, dict) or not user_data.get("id"):
+        raise HTTPException(status_code=400, detail="User ID missing from user data")
+
+    return TelegramIdentity(
+        telegram_id=int(user_data["id"]),
+        first_name=user_data.get("first_name", ""),
+        last_name=user_data.get("last_name"),
+        username=user_data.get("username"),
+        language_code=user_data.get("language_code"),
+    )
+
+
+def get_identity(request: Request) -> TelegramIdentity:
+    """
+    Dependency returning the identity put into the request state by AuthMiddleware.
+    """
+    if getattr(request.state, "validated_params", None) is None:
+        raise HTTPException(
+            status_code=401,
+            detail="User not authenticated",
+        )
+
+    identity = getattr(request.state, "identity", None)
+    if identity is None:
+        raise HTTPException(
+            status_code=401,
+            detail="User data missing from request",
+        )
+
+    return identity
@@ -1,45 +1,34 @@
 from typing import List
 from functools import wraps
 
-from fastapi import Request, HTTPException, Depends, Path
+from fastapi import HTTPException
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database import get_db
-from app.crud import get_user_by_tID
-import json
+from app.models import User, UserRoleModel
+from app.utils.identity import get_identity
 
 
 def role_required(allowed_roles: List[str]):
+    """
+    Allow the route only to users whose role is one of `allowed_roles`.
+
+    The decorated route keeps its own signature (FastAPI reads it through
+    `functools.wraps`) and must declare `request: Request` and a `db` session.
+    """
+
     def decorator(func):
         @wraps(func)
-        async def wrapper(
-            request: Request,
-            db: AsyncSession = Depends(get_db),
-            user_id: int = Path(...),
-        ):
-            # Retrieve the validated params stored in the request by the middleware
-            user_data = request.state.validated_params.get("user")
-
-            # Ensure user_data is a valid dictionary
-            if isinstance(user_data, str):
-                try:
-                    user_data = json.loads(user_data)
-                except json.JSONDecodeError:
-                    raise HTTPException(
-                        status_code=400, detail="Invalid user data format"
-                    )
-
-            # Access the Telegram ID from user data
-            telegram_id = user_data.get("id")
-            if not telegram_id:
-                raise HTTPException(status_code=403, detail="User ID not found")
+        async def wrapper(**kwargs):
+            # Retrieve the identity decoded by the auth layer
+            identity = get_identity(kwargs["request"])
 
             # Fetch the user role from the database using Telegram ID
-            user_role = await get_user_role(db, telegram_id)
+            user_role = await get_user_role(kwargs["db"], identity.telegram_id)
             if user_role not in allowed_roles:
                 raise HTTPException(status_code=403, detail="Insufficient permissions")
 
             # Proceed with the original function
-            return await func(user_id=user_id, db=db, request=request)
+            return await func(**kwargs)
 
         return wrapper
 
@@ -47,9 +36,12 @@ def role_required(allowed_roles: List[str]):
 
 
 async def get_user_role(db: AsyncSession, telegram_id: int):
-    """Fetch the user role based on the Telegram ID."""
-    user = await get_user_by_tID(db, telegram_id)
-    return user.role.role_name if user else None
+    """Fetch the user role based on the Telegram ID, without loading the profile."""
+    return await db.scalar(
+        select(UserRoleModel.role_name)
+        .join(User, User.role_id == UserRoleModel.id)
+        .where(User.telegram_id == telegram_id)
+    )
 
 
 # # Example usage in a route
@@ -0,0 +1,89 @@
+import asyncio
+import os
+
+from dotenv import load_dotenv
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+# Load environment variables from .env file
+load_dotenv()
+
+# Load the DATABASE_URL from the .env files or from shell enviroment variables
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+print("Working with db from: ", DATABASE_URL)
+
+async_engine = create_async_engine(DATABASE_URL)
+
+
+# Users without any ledger entry get one entry per claimed reward (dated when it was
+# received) plus a "backfill" entry for the rest of their points (dated at sign-up)
+BACKFILL_LEDGER = text(
+    """
+    WITH pending AS (
+        SELECT u.id, u.points, coalesce(u.created_at, now()) AS created_at
+        FROM users u
+        WHERE NOT EXISTS (SELECT 1 FROM points_ledger pl WHERE pl.user_id = u.id)
+    ),
+    rewarded AS (
+        SELECT ur.user_id, r.points AS delta, ur.received_at AS created_at
+        FROM user_rewards ur
+        JOIN rewards r ON r.id = ur.reward_id
+        JOIN pending p ON p.id = ur.user_id
+        WHERE coalesce(r.points, 0) <> 0
+    ),
+    balance AS (
+        SELECT p.id AS user_id,
+               p.points - coalesce(
+                   (SELECT sum(w.delta) FROM rewarded w WHERE w.user_id = p.id), 0
+               ) AS delta,
+               p.created_at
+        FROM pending p
+    )
+    INSERT INTO points_ledger (user_id, delta, source, created_at)
+    SELECT user_id, delta, 'quest_reward', created_at FROM rewarded
+    UNION ALL
+    SELECT user_id, delta, 'backfill', created_at FROM balance WHERE delta <> 0
+    """
+)
+
+# The ledger is the source of truth, rollups are recomputed from it
+REBUILD_ROLLUPS = text(
+    """
+    INSERT INTO user_points_daily (user_id, day, points)
+    SELECT user_id, created_at::date, sum(delta)
+    FROM points_ledger
+    GROUP BY user_id, created_at::date
+    ON CONFLICT (user_id, day) DO UPDATE SET points = excluded.points
+    """
+)
+
+# Users whose points do not match the sum of their ledger entries
+COUNT_MISMATCHES = text(
+    """
+    SELECT count(*)
+    FROM users u
+    LEFT JOIN (
+        SELECT user_id, sum(delta) AS total FROM points_ledger GROUP BY user_id
+    ) l ON l.user_id = u.id
+    WHERE u.points <> coalesce(l.total, 0)
+    """
+)
+
+
+async def backfill():
+    async with async_engine.begin() as conn:
+        result = await conn.execute(BACKFILL_LEDGER)
+        print(f"Inserted {result.rowcount} ledger entries")
+
+        result = await conn.execute(REBUILD_ROLLUPS)
+        print(f"Rebuilt {result.rowcount} daily rollups")
+
+        mismatches = (await conn.execute(COUNT_MISMATCHES)).scalar()
+        print(f"Users whose points differ from their ledger: {mismatches}")
+
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill())
@@ -0,0 +1,95 @@
+"""
+Microbenchmark of the per-request Telegram initData authentication cost.
+
+Compares the original path (full validation with the secret key derived on
+every call) with the cached path used by AuthMiddleware.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_auth
+"""
+
+import hashlib
+import hmac
+import json
+import time
+import timeit
+import urllib.parse
+
+from app.utils.auth_middleware import (
+    get_secret_key,
+    init_data_cache,
+    validate_init_data,
+    verify_init_data,
+)
+
+BOT_TOKEN = "123456:benchmark-token"
+ITERATIONS = 20000
+
+
+def build_init_data(bot_token: str) -> str:
+    """Build an initData string signed the same way Telegram does."""
+    user = json.dumps(
+        {
+            "id": 99281932,
+            "first_name": "Andrew",
+            "last_name": "Rogue",
+            "username": "rogue",
+            "language_code": "en",
+            "is_premium": True,
+            "allows_write_to_pm": True,
+        },
+        separators=(",", ":"),
+    )
+    params = {
+        "user": user,
+        "auth_date": str(int(time.time())),
+        "chat_type": "sender",
+        "chat_instance": "8428209589180549439",
+        "start_param": "debug",
+    }
+    data_check_string = "\n".join(f"{k}={v}" for k, v in sorted(params.items()))
+    secret_key = hmac.new(b"WebAppData", bot_token.encode(), hashlib.sha256).digest()
+    params["hash"] = hmac.new(
+        secret_key, data_check_string.encode(), hashlib.sha256
+    ).hexdigest()
+    # Signed over the decoded JSON, sent URL-encoded once
+    params["user"] = urllib.parse.quote(user)
+    return "&".join(f"{k}={v}" for k, v in params.items())
+
+
+def uncached(init_data_raw: str):
+    # Reproduces the original behaviour: the secret key is derived every time
+    get_secret_key.cache_clear()
+    return validate_init_data(init_data_raw, BOT_TOKEN)
+
+
+def main():
+    init_data_raw = build_init_data(BOT_TOKEN)
+    # Only a payload whose user field decodes measures the real request path
+    _, identity = verify_init_data(init_data_raw, BOT_TOKEN)
+    assert identity is not None and identity.telegram_id == 99281932
+    init_data_cache.clear()
+
+    results = {
+        "validate (before)": timeit.timeit(
+            lambda: uncached(init_data_raw), number=ITERATIONS
+        ),
+        "validate, cached secret": timeit.timeit(
+            lambda: validate_init_data(init_data_raw, BOT_TOKEN), number=ITERATIONS
+        ),
+        "verify, cached payload (after)": timeit.timeit(
+            lambda: verify_init_data(init_data_raw, BOT_TOKEN), number=ITERATIONS
+        ),
+    }
+
+    baseline = results["validate (before)"]
+    for name, total in results.items():
+        per_call_us = total / ITERATIONS * 1e6
+        print(f"{name:<32} {per_call_us:8.2f} us/request  x{baseline / total:5.1f}")
+
+    print("cache stats:", init_data_cache.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Measure what conditional GETs save on the quest endpoints.
+
+Every endpoint is requested without and with a matching If-None-Match, once
+with reads going to the database and once served from the loaded quest
+catalog. Reports p50 latency and the response body bytes per request.
+The quests are read from the database configured by DATABASE_URL.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_etag
+"""
+
+import asyncio
+import os
+import statistics
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from app.api.quest_routes import router as quest_router
+from app.catalog import catalog
+from app.database import AsyncSessionLocal, engine
+from app.utils.auth_middleware import AuthMiddleware
+from benchmarks.bench_auth import BOT_TOKEN, build_init_data
+
+REQUESTS = 1000
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(AuthMiddleware)
+    app.include_router(quest_router, prefix="/api/v1")
+    return app
+
+
+async def measure(client: httpx.AsyncClient, path: str, headers: dict) -> tuple:
+    for _ in range(20):
+        await client.get(path, headers=headers)
+
+    latencies = []
+    body_bytes = 0
+    for _ in range(REQUESTS):
+        started = time.perf_counter()
+        response = await client.get(path, headers=headers)
+        latencies.append(time.perf_counter() - started)
+        body_bytes += len(response.content)
+
+    return statistics.median(latencies) * 1000, body_bytes / REQUESTS, response
+
+
+async def main():
+    os.environ["BOT_TOKEN"] = BOT_TOKEN
+    engine.echo = False
+    headers = {"Authorization": f"tma {build_init_data(BOT_TOKEN)}"}
+
+    async with AsyncSessionLocal() as db:
+        await catalog.load(db)
+    quest_id = catalog.page(limit=1)[0][0].id
+    paths = (
+        "/api/v1/quests?limit=50",
+        f"/api/v1/quests/{quest_id}",
+        f"/api/v1/quests/{quest_id}/rewards",
+    )
+
+    transport = httpx.ASGITransport(app=build_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for mode, enabled in (("database", False), ("catalog", True)):
+            catalog.enabled = enabled
+            for path in paths:
+                full_ms, full_bytes, response = await measure(client, path, headers)
+                conditional = {**headers, "If-None-Match": response.headers["ETag"]}
+                cached_ms, cached_bytes, response = await measure(
+                    client, path, conditional
+                )
+                assert response.status_code == 304
+                print(
+                    f"{mode:<9} {path[:44]:<44} "
+                    f"200: p50={full_ms:6.3f}ms {full_bytes:7.0f}B  "
+                    f"304: p50={cached_ms:6.3f}ms {cached_bytes:3.0f}B"
+                )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,130 @@
+"""
+Benchmark the leaderboard at different user counts.
+
+Compares the previous implementation (every user loaded twice into Python)
+with the SQL-ranked get_data_leaderboard. Users are generated inside a
+throw-away `leaderboard_bench` schema of the DATABASE_URL database, which is
+dropped afterwards.
+
+Run from the repository root (sizes are optional):
+
+    python -m benchmarks.bench_leaderboard 10000 100000 1000000
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+from dotenv import load_dotenv
+from sqlalchemy import desc, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.crud import get_data_leaderboard
+from app.database import Base
+from app.models import User as UserModel
+
+load_dotenv()
+
+BENCH_SCHEMA = "leaderboard_bench"
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+ROUNDS = 5
+DAYS = 7
+
+
+async def legacy_get_data_leaderboard(telegram_id: int, days: int, db: AsyncSession):
+    """The previous implementation, kept for comparison."""
+    cutoff_date = datetime.utcnow() - timedelta(days=days)
+    query_top = (
+        select(UserModel)
+        .where(UserModel.updated_at >= cutoff_date)
+        .order_by(desc(UserModel.points))
+    )
+    query_user = select(UserModel).order_by(desc(UserModel.points))
+    all_users = (await db.execute(query_top)).scalars().all()
+    user_info = (await db.execute(query_user)).scalars().all()
+
+    users_list = [
+        {"id": str(user.id), "points": user.points, "position": index + 1}
+        for index, user in enumerate(all_users[:days])
+    ]
+    current_user = next(
+        (
+            {"id": str(user.id), "points": user.points, "position": index + 1}
+            for index, user in enumerate(user_info)
+            if user.telegram_id == telegram_id
+        ),
+        None,
+    )
+    return {"users": users_list, "currentUser": current_user}
+
+
+async def sql_leaderboard(telegram_id: int, days: int, db: AsyncSession):
+    # All-time ranking, returning as many top users as the legacy version
+    return await get_data_leaderboard(telegram_id, None, days, db)
+
+
+async def populate(engine, size: int):
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {BENCH_SCHEMA}"))
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            text(
+                """
+                INSERT INTO users (id, telegram_id, first_name, last_name, image_url,
+                                   points, level, coins, created_at, updated_at)
+                SELECT gen_random_uuid(), n, 'User', n::text, '', (random() * 10000)::int,
+                       0, 0, now(), now() - (random() * 30) * interval '1 day'
+                FROM generate_series(1, :size) AS n
+                """
+            ),
+            {"size": size},
+        )
+        await conn.execute(text("ANALYZE users"))
+
+
+async def timed(session_factory, loader, telegram_id: int) -> list:
+    latencies = []
+    for _ in range(ROUNDS):
+        async with session_factory() as db:
+            started = time.perf_counter()
+            await loader(telegram_id, DAYS, db)
+            latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+async def main(sizes):
+    engine = create_async_engine(
+        os.getenv("DATABASE_URL"),
+        connect_args={"server_settings": {"search_path": BENCH_SCHEMA}},
+    )
+    session_factory = sessionmaker(
+        bind=engine, class_=AsyncSession, expire_on_commit=False
+    )
+    try:
+        for size in sizes:
+            await populate(engine, size)
+            # A user from the middle of the table
+            telegram_id = size // 2
+            for name, loader in (
+                ("python ranking", legacy_get_data_leaderboard),
+                ("sql ranking", sql_leaderboard),
+            ):
+                latencies = await timed(session_factory, loader, telegram_id)
+                print(
+                    f"{size:>9} users  {name:<15} "
+                    f"p50={statistics.median(latencies):9.2f}ms "
+                    f"max={max(latencies):9.2f}ms"
+                )
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE"))
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main([int(size) for size in sys.argv[1:]] or DEFAULT_SIZES))
@@ -0,0 +1,132 @@
+"""
+Benchmark leaderboard reads from snapshots against live ranking under concurrent load.
+
+Users and a month of daily point rollups are generated inside a throw-away
+`leaderboard_bench` schema of the DATABASE_URL database, which is dropped
+afterwards. For every period, CONCURRENCY clients request the current user's
+leaderboard page (top users plus their position) in parallel, once computed
+live and once served from the refreshed snapshot.
+
+Run from the repository root (sizes are optional):
+
+    python -m benchmarks.bench_leaderboard_snapshots 100000 1000000
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+from dotenv import load_dotenv
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import crud
+from app.database import Base
+
+load_dotenv()
+
+BENCH_SCHEMA = "leaderboard_bench"
+DEFAULT_SIZES = (100_000,)
+CONCURRENCY = 32
+REQUESTS = 256
+PERIODS = {"day": 1, "week": 7, "allTime": None}
+
+
+async def populate(engine, size: int):
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {BENCH_SCHEMA}"))
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            text(
+                """
+                INSERT INTO users (id, telegram_id, first_name, last_name, image_url,
+                                   points, level, coins, created_at, updated_at)
+                SELECT gen_random_uuid(), n, 'User', n::text, '', (random() * 10000)::int,
+                       0, 0, now(), now()
+                FROM generate_series(1, :size) AS n
+                """
+            ),
+            {"size": size},
+        )
+        # Roughly a third of the users earn points on any given day
+        await conn.execute(
+            text(
+                """
+                INSERT INTO user_points_daily (user_id, day, points)
+                SELECT id, current_date - d, (random() * 100)::int + 1
+                FROM users, generate_series(0, 29) AS d
+                WHERE random() < 0.3
+                """
+            )
+        )
+        await conn.execute(text("ANALYZE"))
+
+
+async def run_load(session_factory, telegram_id: int, days) -> list:
+    latencies = []
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def one_request():
+        async with semaphore:
+            async with session_factory() as db:
+                started = time.perf_counter()
+                await crud.get_data_leaderboard(telegram_id, days, 10, db)
+                latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one_request() for _ in range(REQUESTS)))
+    elapsed = time.perf_counter() - started
+    return latencies, REQUESTS / elapsed
+
+
+async def main(sizes):
+    engine = create_async_engine(
+        os.getenv("DATABASE_URL"),
+        pool_size=CONCURRENCY,
+        connect_args={"server_settings": {"search_path": BENCH_SCHEMA}},
+    )
+    session_factory = sessionmaker(
+        bind=engine, class_=AsyncSession, expire_on_commit=False
+    )
+    try:
+        for size in sizes:
+            await populate(engine, size)
+            telegram_id = size // 2  # A user from the middle of the table
+
+            async with session_factory() as db:
+                started = time.perf_counter()
+                await crud.refresh_leaderboard_snapshots(db)
+                refresh_seconds = time.perf_counter() - started
+                started = time.perf_counter()
+                await crud.refresh_leaderboard_snapshots(db)
+                noop_seconds = time.perf_counter() - started
+            print(
+                f"{size:>9} users  snapshot refresh {refresh_seconds:6.2f}s "
+                f"(unchanged: {noop_seconds * 1000:.1f}ms)"
+            )
+
+            for period, days in PERIODS.items():
+                for name, enabled in (("live", False), ("snapshot", True)):
+                    crud.LEADERBOARD_SNAPSHOTS_ENABLED = enabled
+                    latencies, throughput = await run_load(
+                        session_factory, telegram_id, days
+                    )
+                    latencies.sort()
+                    print(
+                        f"{size:>9} users  {period:<8} {name:<9} "
+                        f"p50={statistics.median(latencies):8.2f}ms "
+                        f"p95={latencies[int(len(latencies) * 0.95)]:8.2f}ms "
+                        f"{throughput:8.1f} req/s"
+                    )
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE"))
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main([int(size) for size in sys.argv[1:]] or DEFAULT_SIZES))
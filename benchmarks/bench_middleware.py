@@ -0,0 +1,121 @@
+"""
+Compare the pure ASGI AuthMiddleware with the previous BaseHTTPMiddleware stack.
+
+Reports p50/p99 latency and requests/sec for /health and /api/v1/quests.
+/api/v1/quests talks to the database configured by DATABASE_URL.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_middleware
+"""
+
+import asyncio
+import os
+import statistics
+import time
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.api.quest_routes import router as quest_router
+from app.database import engine
+from app.utils.auth_middleware import (
+    AuthMiddleware,
+    authenticate,
+    is_excluded_path,
+)
+from benchmarks.bench_auth import BOT_TOKEN, build_init_data
+
+REQUESTS = 2000
+CONCURRENCY = 50
+
+
+class LegacyAuthMiddleware(BaseHTTPMiddleware):
+    """The previous BaseHTTPMiddleware based implementation, kept for comparison."""
+
+    async def dispatch(self, request: Request, call_next):
+        if is_excluded_path(request.url.path):
+            return await call_next(request)
+
+        params, identity = authenticate(request.headers.get("Authorization"))
+        request.state.validated_params = params
+        request.state.identity = identity
+        return await call_next(request)
+
+
+def build_app(auth_middleware) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(auth_middleware)
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    app.include_router(quest_router, prefix="/api/v1")
+
+    @app.get("/health")
+    async def health_check():
+        return {"status": "healthy"}
+
+    return app
+
+
+async def measure(client: httpx.AsyncClient, path: str, headers: dict) -> dict:
+    # Warm up connections and caches
+    for _ in range(50):
+        await client.get(path, headers=headers)
+
+    latencies = []
+    for _ in range(REQUESTS):
+        started = time.perf_counter()
+        response = await client.get(path, headers=headers)
+        latencies.append(time.perf_counter() - started)
+        response.raise_for_status()
+
+    async def worker(count: int):
+        for _ in range(count):
+            await client.get(path, headers=headers)
+
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(worker(REQUESTS // CONCURRENCY) for _ in range(CONCURRENCY))
+    )
+    elapsed = time.perf_counter() - started
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "p50_ms": quantiles[49] * 1000,
+        "p99_ms": quantiles[98] * 1000,
+        "rps": REQUESTS / elapsed,
+    }
+
+
+async def main():
+    os.environ["BOT_TOKEN"] = BOT_TOKEN
+    engine.echo = False
+    headers = {"Authorization": f"tma {build_init_data(BOT_TOKEN)}"}
+
+    for name, middleware in (
+        ("BaseHTTPMiddleware", LegacyAuthMiddleware),
+        ("pure ASGI", AuthMiddleware),
+    ):
+        transport = httpx.ASGITransport(app=build_app(middleware))
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            for path in ("/health", "/api/v1/quests"):
+                result = await measure(client, path, headers)
+                print(
+                    f"{name:<20} {path:<16} p50={result['p50_ms']:.3f}ms "
+                    f"p99={result['p99_ms']:.3f}ms rps={result['rps']:.0f}"
+                )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
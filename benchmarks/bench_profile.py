@@ -0,0 +1,209 @@
+"""
+Compare the joinedload profile query with the split-query profile loader.
+
+Seeds benchmark users holding 60 quest progress rows and 20 achievements each,
+then reports rows/bytes transferred and latency of both loaders.
+Uses the database configured by DATABASE_URL; benchmark rows are removed afterwards.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_profile
+"""
+
+import asyncio
+import statistics
+import time
+import uuid
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import joinedload
+
+from app.catalog import catalog
+from app.crud import get_user_by_tID
+from app.database import AsyncSessionLocal, engine
+from app.models import (
+    Achievement,
+    Quest,
+    User,
+    UserAchievementModel,
+    UserQuestProgress,
+    UserRoleModel,
+)
+from app.schemas import User as UserSchema
+
+USERS = 20
+PROGRESS_PER_USER = 60
+ACHIEVEMENTS_PER_USER = 20
+ROUNDS = 5
+TELEGRAM_ID_BASE = 9_000_000_000
+
+
+def legacy_query(telegram_id: int):
+    return (
+        select(User)
+        .where(User.telegram_id == telegram_id)
+        .options(
+            joinedload(User.quest_progress).joinedload(UserQuestProgress.quest),
+            joinedload(User.achievements).joinedload(UserAchievementModel.achievement),
+            joinedload(User.role),
+        )
+    )
+
+
+async def legacy_get_user_by_tID(db, telegram_id: int):
+    result = await db.execute(legacy_query(telegram_id))
+    user = result.unique().scalars().first()
+    user.quest_progress = list(reversed(user.quest_progress))
+    return UserSchema.model_validate(user)
+
+
+def split_queries(user_id):
+    return [
+        select(User.__table__, UserRoleModel.role_name)
+        .outerjoin(UserRoleModel, UserRoleModel.id == User.role_id)
+        .where(User.id == user_id),
+        select(UserQuestProgress.__table__)
+        .where(UserQuestProgress.user_id == user_id)
+        .order_by(UserQuestProgress.created_at.desc()),
+        select(UserAchievementModel.__table__).where(
+            UserAchievementModel.user_id == user_id
+        ),
+    ]
+
+
+async def transferred(conn, statement) -> tuple:
+    """Row count and approximate payload bytes of a statement's result set."""
+    rows = (await conn.execute(statement)).all()
+    size = sum(len(str(value)) for row in rows for value in row if value is not None)
+    return len(rows), size
+
+
+async def seed():
+    async with AsyncSessionLocal() as db:
+        role = UserRoleModel(role_name=f"bench-{uuid.uuid4()}")
+        quests = [
+            Quest(
+                type="Бенчмарк",
+                name=f"Bench quest {i}",
+                description="Опис квесту " * 10,
+                long_description="Довгий опис квесту для вимірювання " * 30,
+                requirements="Вимоги до квесту " * 10,
+                award="нагорода",
+                goal="мета",
+            )
+            for i in range(PROGRESS_PER_USER)
+        ]
+        achievements = [
+            Achievement(name=f"bench-{i}", description="Опис досягнення " * 5)
+            for i in range(ACHIEVEMENTS_PER_USER)
+        ]
+        db.add_all([role, *quests, *achievements])
+        await db.flush()
+
+        users = []
+        for n in range(USERS):
+            user = User(
+                telegram_id=TELEGRAM_ID_BASE + n,
+                first_name="Bench",
+                last_name=str(n),
+                role_id=role.id,
+            )
+            db.add(user)
+            users.append(user)
+        await db.flush()
+
+        for user in users:
+            db.add_all(
+                UserQuestProgress(user_id=user.id, quest_id=q.id, status="IN_PROGRESS")
+                for q in quests
+            )
+            db.add_all(
+                UserAchievementModel(user_id=user.id, achievement_id=a.id)
+                for a in achievements
+            )
+        await db.commit()
+        return role, quests, achievements, users
+
+
+async def cleanup(role, quests, achievements, users):
+    user_ids = [u.id for u in users]
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            delete(UserQuestProgress).where(UserQuestProgress.user_id.in_(user_ids))
+        )
+        await db.execute(
+            delete(UserAchievementModel).where(
+                UserAchievementModel.user_id.in_(user_ids)
+            )
+        )
+        await db.execute(delete(User).where(User.id.in_(user_ids)))
+        await db.execute(delete(Quest).where(Quest.id.in_([q.id for q in quests])))
+        await db.execute(
+            delete(Achievement).where(Achievement.id.in_([a.id for a in achievements]))
+        )
+        await db.execute(delete(UserRoleModel).where(UserRoleModel.id == role.id))
+        await db.commit()
+
+
+async def timed(loader) -> list:
+    latencies = []
+    for _ in range(ROUNDS):
+        for n in range(USERS):
+            async with AsyncSessionLocal() as db:
+                started = time.perf_counter()
+                await loader(db, TELEGRAM_ID_BASE + n)
+                latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+async def main():
+    engine.echo = False
+    seeded = await seed()
+    users = seeded[3]
+    try:
+        async with engine.connect() as conn:
+            legacy_rows, legacy_bytes = await transferred(
+                conn, legacy_query(users[0].telegram_id)
+            )
+            split_rows = split_bytes = 0
+            for statement in split_queries(users[0].id):
+                rows, size = await transferred(conn, statement)
+                split_rows += rows
+                split_bytes += size
+            catalog_rows = catalog_bytes = 0
+            for statement in (
+                select(Quest).where(Quest.id.in_([q.id for q in seeded[1]])),
+                select(Achievement).where(
+                    Achievement.id.in_([a.id for a in seeded[2]])
+                ),
+            ):
+                rows, size = await transferred(conn, statement)
+                catalog_rows += rows
+                catalog_bytes += size
+
+        print(f"joinedload        rows={legacy_rows:6d} bytes={legacy_bytes:10d}")
+        print(f"split, warm cache rows={split_rows:6d} bytes={split_bytes:10d}")
+        print(
+            f"split, cold cache rows={split_rows + catalog_rows:6d} "
+            f"bytes={split_bytes + catalog_bytes:10d}"
+        )
+
+        catalog.quests.clear()
+        catalog.achievements.clear()
+        for name, loader in (
+            ("joinedload", legacy_get_user_by_tID),
+            ("split queries", get_user_by_tID),
+        ):
+            latencies = await timed(loader)
+            print(
+                f"{name:<17} p50={statistics.median(latencies):.2f}ms "
+                f"max={max(latencies):.2f}ms"
+            )
+        print("catalog stats:", catalog.quests.stats())
+    finally:
+        await cleanup(*seeded)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
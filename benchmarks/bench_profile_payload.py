@@ -0,0 +1,118 @@
+"""
+Compare serialization time and payload size of the nested and normalized
+GET /api/v1/user response shapes for a heavy profile.
+
+Runs entirely in memory. From the repository root:
+
+    python -m benchmarks.bench_profile_payload
+"""
+
+import timeit
+import uuid
+from datetime import datetime
+
+from app.schemas import (
+    Achievement,
+    NormalizedUserResponse,
+    Quest,
+    User,
+    UserAchievement,
+    UserQuestProgress,
+    UserResponse,
+    UserRoleResponse,
+)
+
+QUESTS = 60
+ACHIEVEMENTS = 20
+ITERATIONS = 200
+REPEAT = 5
+
+
+def build_user() -> User:
+    now = datetime.now()
+    user_id = uuid.uuid4()
+    quests = [
+        Quest(
+            id=uuid.uuid4(),
+            type="Пригодницький квест",
+            name=f"Підйом на вершину {i}",
+            image_url="https://quests-app-bucket.s3.eu-north-1.amazonaws.com/images/adventure.png",
+            description="Проходження кар’єрного коучинга, навчальних курсів " * 2,
+            award="підвищення класу, рівня, артефакти, мідні монети",
+            goal="Проходження кар’єрного коучинга та подібних завдань",
+            requirements="Необхідно пройти попередні рівні квестів " * 2,
+            required_level=2,
+            long_description="Цей квест відкриває перед вами можливості " * 10,
+            created_at=now,
+        )
+        for i in range(QUESTS)
+    ]
+    achievements = [
+        Achievement(
+            id=uuid.uuid4(),
+            name=f"Досягнення {i}",
+            description="Отримати перший рівень " * 3,
+            image_url="https://quests-app-bucket.s3.eu-north-1.amazonaws.com/images/achievement_1.png",
+            created_at=now,
+        )
+        for i in range(ACHIEVEMENTS)
+    ]
+    return User(
+        id=user_id,
+        telegram_id=99281932,
+        first_name="Andrew",
+        last_name="Rogue",
+        role=UserRoleResponse(role_name="adventurer"),
+        created_at=now,
+        # Every quest is referenced by two progress rows (e.g. repeated quests)
+        quest_progress=[
+            UserQuestProgress(
+                id=uuid.uuid4(),
+                quest_id=quest.id,
+                status="IN_PROGRESS",
+                progress=0.0,
+                mentor_comment="",
+                created_at=now,
+                quest=quest,
+            )
+            for quest in quests * 2
+        ],
+        achievements=[
+            UserAchievement(
+                id=uuid.uuid4(),
+                user_id=user_id,
+                achievement_id=achievement.id,
+                status="active",
+                achievement=achievement,
+            )
+            for achievement in achievements
+        ],
+    )
+
+
+def nested(user: User) -> bytes:
+    # Mirrors FastAPI's response_model handling of the nested route
+    response = UserResponse(message="User data fetched from the database", user=user)
+    return response.model_dump_json(by_alias=True).encode()
+
+
+def normalized(user: User) -> bytes:
+    return NormalizedUserResponse.from_user(
+        user, "User data fetched from the database"
+    ).to_json().encode()
+
+
+def main():
+    user = build_user()
+    for name, serializer in (("nested", nested), ("normalized", normalized)):
+        size = len(serializer(user))
+        seconds = min(
+            timeit.repeat(lambda: serializer(user), number=ITERATIONS, repeat=REPEAT)
+        )
+        print(
+            f"{name:<11} {size:8d} bytes  {seconds / ITERATIONS * 1000:6.3f} ms/response"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Benchmark paging through a large quest catalog with offsets and with cursors.
+
+Quests are generated inside a throw-away `quest_pages_bench` schema of the
+DATABASE_URL database, which is dropped afterwards. The page query alone is
+timed at increasing depths (the total count is the same in both modes), and
+the whole catalog is then walked page by page with cursors.
+
+Run from the repository root (size is optional):
+
+    python -m benchmarks.bench_quest_pages 100000
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+from dotenv import load_dotenv
+from sqlalchemy import select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.crud import get_quests
+from app.database import Base
+from app.models import Quest as QuestModel
+
+load_dotenv()
+
+BENCH_SCHEMA = "quest_pages_bench"
+DEFAULT_SIZE = 100_000
+PAGE_SIZE = 20
+ROUNDS = 5
+
+
+async def populate(engine, size: int):
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {BENCH_SCHEMA}"))
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            text(
+                """
+                INSERT INTO quests (id, type, name, image_url, description, award, goal,
+                                    requirements, required_level, long_description,
+                                    created_at)
+                SELECT gen_random_uuid(), 'Daily', 'Quest ' || n, '', repeat('d', 200),
+                       '', '', '', 0, repeat('l', 1000),
+                       now() - (random() * 365) * interval '1 day'
+                FROM generate_series(1, :size) AS n
+                """
+            ),
+            {"size": size},
+        )
+        await conn.execute(text("ANALYZE quests"))
+
+
+def ordered_page():
+    return (
+        select(QuestModel)
+        .order_by(QuestModel.created_at, QuestModel.id)
+        .limit(PAGE_SIZE + 1)
+    )
+
+
+async def timed(session_factory, query) -> float:
+    latencies = []
+    for _ in range(ROUNDS):
+        async with session_factory() as db:
+            started = time.perf_counter()
+            (await db.execute(query)).scalars().all()
+            latencies.append((time.perf_counter() - started) * 1000)
+    return statistics.median(latencies)
+
+
+async def main(size: int):
+    engine = create_async_engine(
+        os.getenv("DATABASE_URL"),
+        connect_args={"server_settings": {"search_path": BENCH_SCHEMA}},
+    )
+    session_factory = sessionmaker(
+        bind=engine, class_=AsyncSession, expire_on_commit=False
+    )
+    try:
+        await populate(engine, size)
+
+        for depth in (0, size // 100, size // 10, size // 2, size - PAGE_SIZE):
+            # The key of the last quest before the page, as a cursor would carry it
+            async with session_factory() as db:
+                boundary = (
+                    await db.execute(
+                        select(QuestModel.created_at, QuestModel.id)
+                        .order_by(QuestModel.created_at, QuestModel.id)
+                        .offset(max(depth - 1, 0))
+                        .limit(1)
+                    )
+                ).one()
+
+            offset_ms = await timed(session_factory, ordered_page().offset(depth))
+            cursor_ms = await timed(
+                session_factory,
+                ordered_page().where(
+                    tuple_(QuestModel.created_at, QuestModel.id) > tuple_(*boundary)
+                ),
+            )
+            print(
+                f"{size:>7} quests  row {depth:>7}  "
+                f"offset={offset_ms:8.2f}ms  cursor={cursor_ms:6.2f}ms"
+            )
+
+        # Full walk through the catalog with cursors, as a client would do it
+        started = time.perf_counter()
+        pages = 0
+        after = None
+        async with session_factory() as db:
+            while True:
+                _, after = await get_quests(db, limit=PAGE_SIZE * 5, after=after)
+                pages += 1
+                if after is None:
+                    break
+        print(
+            f"{size:>7} quests  cursor walk of {pages} pages in "
+            f"{time.perf_counter() - started:.2f}s"
+        )
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE"))
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SIZE))
@@ -0,0 +1,78 @@
+"""
+Benchmark the in-process rank index at different user counts.
+
+Builds a RankIndex from randomly generated users (no database needed) and
+measures the build time, the memory held by the index, and the latency of
+position lookups, top-N and neighbour windows, and incremental point updates.
+
+Run from the repository root (sizes are optional):
+
+    python -m benchmarks.bench_rank_index 100000 1000000
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+import uuid
+
+from app.rank_index import RankIndex
+
+DEFAULT_SIZES = (100_000, 1_000_000)
+OPERATIONS = 20_000
+
+
+def generate_users(count: int):
+    rng = random.Random(count)
+    users = [
+        (uuid.UUID(int=rng.getrandbits(128), version=4), int(rng.paretovariate(1.2) * 10))
+        for _ in range(count)
+    ]
+    users.sort(key=lambda user: (user[1], user[0].int), reverse=True)
+    return users
+
+
+def per_operation_us(func, arguments) -> float:
+    started = time.perf_counter()
+    for argument in arguments:
+        func(argument)
+    return (time.perf_counter() - started) / len(arguments) * 1e6
+
+
+def bench(count: int):
+    users = generate_users(count)
+    rng = random.Random(0)
+    sample = [rng.choice(users)[0] for _ in range(OPERATIONS)]
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    index = RankIndex()
+    index.load_sorted(users)
+    build_seconds = time.perf_counter() - started
+    memory_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    position_us = per_operation_us(index.position, sample)
+    top_us = per_operation_us(lambda _: index.top(10), sample[:2000])
+    around_us = per_operation_us(lambda user_id: index.around(user_id, 5), sample[:2000])
+    update_us = per_operation_us(
+        lambda user_id: index.update(user_id, index.points(user_id) + rng.randint(1, 50)),
+        sample,
+    )
+
+    print(
+        f"{count:>9} users | build {build_seconds:6.2f}s | "
+        f"{memory_bytes / count:6.1f} B/user ({memory_bytes / 2**20:7.1f} MiB) | "
+        f"position {position_us:5.1f}µs | top10 {top_us:5.1f}µs | "
+        f"around±5 {around_us:5.1f}µs | update {update_us:5.1f}µs"
+    )
+
+
+def main():
+    sizes = [int(size) for size in sys.argv[1:]] or DEFAULT_SIZES
+    for count in sizes:
+        bench(count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import asyncio
+import os
+import uuid
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+
+
+class ThrowawaySchema:
+    """
+    Empty copy of the tables in its own schema of the DATABASE_URL database,
+    with helpers to seed rows and to run calls in separate sessions.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.session_factory = sessionmaker(
+            bind=engine, class_=AsyncSession, expire_on_commit=False
+        )
+
+    async def add_user(
+        self, telegram_id: int = 1, points: int = 0, level: int = 0, coins: int = 0
+    ) -> uuid.UUID:
+        user_id = uuid.uuid4()
+        async with self.engine.begin() as conn:
+            await conn.execute(
+                text(
+                    "INSERT INTO users (id, telegram_id, first_name, last_name,"
+                    " image_url, points, level, coins, created_at, updated_at)"
+                    " VALUES (:id, :telegram_id, 'Test', 'User', '', :points, :level,"
+                    " :coins, now(), now())"
+                ),
+                {
+                    "id": user_id,
+                    "telegram_id": telegram_id,
+                    "points": points,
+                    "level": level,
+                    "coins": coins,
+                },
+            )
+        return user_id
+
+    async def add_quest(self, name: str = "Quest") -> uuid.UUID:
+        quest_id = uuid.uuid4()
+        async with self.engine.begin() as conn:
+            await conn.execute(
+                text("INSERT INTO quests (id, type, name) VALUES (:id, 'Daily', :name)"),
+                {"id": quest_id, "name": name},
+            )
+        return quest_id
+
+    async def add_progress(self, user_id, quest_id, status: str) -> uuid.UUID:
+        progress_id = uuid.uuid4()
+        async with self.engine.begin() as conn:
+            await conn.execute(
+                text(
+                    "INSERT INTO user_quest_progress (id, user_id, quest_id, status)"
+                    " VALUES (:id, :user_id, :quest_id, :status)"
+                ),
+                {
+                    "id": progress_id,
+                    "user_id": user_id,
+                    "quest_id": quest_id,
+                    "status": status,
+                },
+            )
+        return progress_id
+
+    async def attempt(self, call):
+        """
+        Run `call(db)` in a session of its own; returns its result, or the status
+        code of the HTTPException it raised.
+        """
+        async with self.session_factory() as db:
+            try:
+                return await call(db)
+            except HTTPException as err:
+                return err.status_code
+
+    async def attempt_all(self, calls) -> list:
+        """`attempt` every call at the same time, each on its own connection."""
+        return await asyncio.gather(*(self.attempt(call) for call in calls))
+
+
+@pytest_asyncio.fixture
+async def throwaway_schema():
+    """
+    Factory of ThrowawaySchema: `await throwaway_schema(name, pool_size)`.
+
+    Skips the test if the database is not available; the schemas are dropped
+    after the test.
+    """
+    engines = []
+
+    async def make(schema: str, pool_size: int = 5) -> ThrowawaySchema:
+        engine = create_async_engine(
+            os.getenv("DATABASE_URL"),
+            pool_size=pool_size,
+            connect_args={"server_settings": {"search_path": schema}},
+        )
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+                await conn.execute(text(f"CREATE SCHEMA {schema}"))
+                await conn.run_sync(Base.metadata.create_all)
+        except Exception as err:
+            await engine.dispose()
+            pytest.skip(f"Database not available: {err}")
+        engines.append((schema, engine))
+        return ThrowawaySchema(engine)
+
+    yield make
+
+    for schema, engine in engines:
+        async with engine.begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+        await engine.dispose()
@@ -1,3 +1,6 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -7,9 +10,72 @@ from app.api.leaderboard import router as leaderboard
 from app.admin.admin_routes import router as admin_router
 
 from app.utils.auth_middleware import AuthMiddleware
+from app.catalog import (
+    catalog,
+    QUEST_CATALOG_ENABLED,
+    QUEST_CATALOG_RECONCILE_SECONDS,
+)
+from app.database import AsyncSessionLocal
+from app.crud import (
+    refresh_leaderboard_snapshots,
+    LEADERBOARD_SNAPSHOTS_ENABLED,
+    LEADERBOARD_SNAPSHOT_SECONDS,
+)
+from app.rank_index import (
+    rank_index,
+    RANK_INDEX_ENABLED,
+    RANK_INDEX_RECONCILE_SECONDS,
+)
+
+
+async def refresh_leaderboard_snapshots_forever(interval: float):
+    """Refresh the leaderboard snapshots every `interval` seconds."""
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                await refresh_leaderboard_snapshots(db)
+        except Exception as err:
+            print(f"Leaderboard snapshot refresh failed: {err}")
+        await asyncio.sleep(interval)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the leaderboard rank index in the background and keep reconciling it;
+    # until the first load completes the leaderboard is ranked by the database
+    background_tasks = []
+    if RANK_INDEX_ENABLED:
+        background_tasks.append(
+            asyncio.create_task(
+                rank_index.reconcile_forever(
+                    AsyncSessionLocal, RANK_INDEX_RECONCILE_SECONDS
+                )
+            )
+        )
+    # Same for the quest catalog: quest reads use the database until it is loaded
+    if QUEST_CATALOG_ENABLED:
+        background_tasks.append(
+            asyncio.create_task(
+                catalog.reconcile_forever(
+                    AsyncSessionLocal, QUEST_CATALOG_RECONCILE_SECONDS
+                )
+            )
+        )
+    if LEADERBOARD_SNAPSHOTS_ENABLED:
+        background_tasks.append(
+            asyncio.create_task(
+                refresh_leaderboard_snapshots_forever(LEADERBOARD_SNAPSHOT_SECONDS)
+            )
+        )
+
+    yield
+
+    for task in background_tasks:
+        task.cancel()
+
 
 # Create an instance of the FastAPI application
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Add the AuthMiddleware to the app
 app.add_middleware(AuthMiddleware)
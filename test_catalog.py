@@ -0,0 +1,84 @@
+import asyncio
+import random
+import uuid
+from datetime import datetime, timedelta
+
+from app.catalog import Catalog
+from app.schemas import Quest as QuestSchema
+
+
+def make_quest(rng, created_at):
+    return QuestSchema(
+        id=uuid.UUID(int=rng.getrandbits(128)),
+        type="Daily",
+        name="Quest",
+        image_url="",
+        description="",
+        award="",
+        goal="",
+        requirements="",
+        required_level=0,
+        long_description="",
+        created_at=created_at,
+    )
+
+
+class LoadCountingCatalog(Catalog):
+    """Catalog whose full reload only records that it happened."""
+
+    def __init__(self):
+        super().__init__()
+        self.loads = 0
+
+    async def load(self, db):
+        self.loads += 1
+        self.version = 100
+        self.ready = True
+
+
+def test_catalog_pages_match_sorted_quests():
+    rng = random.Random(7)
+    start = datetime(2026, 1, 1)
+    catalog = LoadCountingCatalog()
+    asyncio.run(catalog.load(None))
+    catalog.version = 0
+
+    quests = []
+    for version in range(1, 41):
+        # Few distinct timestamps, so the id tie break matters
+        quest = make_quest(rng, start + timedelta(days=rng.randrange(5)))
+        quests.append(quest)
+        asyncio.run(catalog.quest_saved(None, version, quest))
+
+    ordered = sorted(quests, key=lambda quest: (quest.created_at, quest.id))
+    assert catalog.total() == 40
+    assert catalog.page(skip=5, limit=7)[0] == ordered[5:12]
+
+    # Walking with keys returns every quest once, in order
+    walked, after = [], None
+    while True:
+        page, after = catalog.page(limit=6, after=after)
+        walked += page
+        if after is None:
+            break
+    assert walked == ordered
+
+    deleted = ordered[3]
+    asyncio.run(catalog.quest_deleted(None, 41, deleted.id))
+    assert catalog.quest(deleted.id) is None
+    assert catalog.page(limit=100)[0] == ordered[:3] + ordered[4:]
+    assert catalog.loads == 1
+
+
+def test_catalog_rebuilds_after_missing_a_version():
+    rng = random.Random(3)
+    catalog = LoadCountingCatalog()
+    asyncio.run(catalog.load(None))
+    catalog.version = 5
+
+    asyncio.run(catalog.quest_saved(None, 6, make_quest(rng, datetime(2026, 1, 1))))
+    assert catalog.version == 6 and catalog.loads == 1
+
+    # Version 7 was written by another worker
+    asyncio.run(catalog.quest_saved(None, 8, make_quest(rng, datetime(2026, 1, 2))))
+    assert catalog.loads == 2
@@ -0,0 +1,81 @@
+# test_identity.py
+
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+import app.utils.identity as identity_module
+from app.utils.auth_middleware import AuthMiddleware, init_data_cache
+from app.utils.identity import TelegramIdentity, get_identity
+from benchmarks.bench_auth import BOT_TOKEN, build_init_data
+
+
+def build_app():
+    app = FastAPI()
+    app.add_middleware(AuthMiddleware)
+
+    async def get_telegram_id(identity: TelegramIdentity = Depends(get_identity)):
+        return identity.telegram_id
+
+    @app.get("/whoami")
+    async def whoami(
+        identity: TelegramIdentity = Depends(get_identity),
+        telegram_id: int = Depends(get_telegram_id),
+    ):
+        return {"telegramId": telegram_id, "username": identity.username}
+
+    return app
+
+
+@pytest.fixture
+def json_parses(monkeypatch):
+    calls = []
+    real_loads = json.loads
+
+    def counting_loads(*args, **kwargs):
+        calls.append(args)
+        return real_loads(*args, **kwargs)
+
+    # Only the JSON decoding done by the identity module is counted
+    monkeypatch.setattr(
+        identity_module,
+        "json",
+        SimpleNamespace(loads=counting_loads, JSONDecodeError=json.JSONDecodeError),
+    )
+    return calls
+
+
+def test_user_payload_parsed_once_per_init_data(monkeypatch, json_parses):
+    monkeypatch.setenv("BOT_TOKEN", BOT_TOKEN)
+    init_data_cache.clear()
+    client = TestClient(build_app())
+    headers = {"Authorization": f"tma {build_init_data(BOT_TOKEN)}"}
+
+    response = client.get("/whoami", headers=headers)
+
+    assert response.status_code == 200
+    assert response.json() == {"telegramId": 99281932, "username": "rogue"}
+    assert len(json_parses) == 1
+
+    # The same initData for the rest of the session is served from the cache
+    for _ in range(3):
+        assert client.get("/whoami", headers=headers).status_code == 200
+    assert len(json_parses) == 1
+
+
+def test_identity_is_immutable():
+    identity = TelegramIdentity(telegram_id=1, first_name="Andrew")
+
+    with pytest.raises(AttributeError):
+        identity.telegram_id = 2
+
+
+def test_missing_authorization_is_rejected_with_400():
+    client = TestClient(build_app())
+
+    response = client.get("/whoami")
+
+    assert response.status_code == 400
@@ -0,0 +1,45 @@
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+from app.quest_search import QuestSearchIndex, facet_counts, search_terms
+
+
+def make_quest(name, quest_type="Daily", description="", required_level=0):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        name=name,
+        type=quest_type,
+        description=description,
+        long_description="",
+        required_level=required_level,
+        created_at=datetime(2026, 1, 1),
+    )
+
+
+def test_search_terms_strip_inflections():
+    assert search_terms("Квести команди") == ["квест", "команд"]
+    assert search_terms("Teams building, team") == ["team", "build"]
+    # Short words are kept whole
+    assert search_terms("за боса") == ["за", "боса"]
+
+
+def test_search_index_matches_all_terms_by_prefix():
+    team = make_quest("Сила команди", "Командний квест", "Золоті монети")
+    boss = make_quest("Міні-бос", "Битва", "Монети за перемогу", required_level=5)
+    index = QuestSearchIndex()
+    index.add(team)
+    index.add(boss)
+
+    assert set(index.search(search_terms("монетами"))) == {team.id, boss.id}
+    assert set(index.search(search_terms("командна монета"))) == {team.id}
+    # Name matches outrank description matches
+    scores = index.search(search_terms("бос"))
+    assert list(scores) == [boss.id]
+
+    index.remove(team.id)
+    assert index.search(search_terms("команд")) == {}
+
+    by_type, by_level = facet_counts([team, boss], ["Битва"], None, 4)
+    assert by_type == {"Командний квест": 1}
+    assert by_level == {"3-5": 1}
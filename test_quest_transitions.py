@@ -0,0 +1,117 @@
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+
+from app.models import UserQuestProgress
+from app.quest_transitions import (
+    IN_PROGRESS,
+    REVIEW_PENDING,
+    TASK_COMPLETED,
+    review_quest_progress,
+    start_quest,
+    transition_quest_progress,
+)
+
+TEST_SCHEMA = "quest_transitions_test"
+PARALLEL = 20
+
+
+async def make_database(throwaway_schema):
+    """Throw-away schema with one user and a quest the user has in progress."""
+    database = await throwaway_schema(TEST_SCHEMA, pool_size=PARALLEL)
+    user_id = await database.add_user()
+    quest_id = await database.add_quest()
+    await database.add_progress(user_id, quest_id, IN_PROGRESS)
+    return database, user_id, quest_id
+
+
+def move(user_id, quest_id, name, **changes):
+    async def call(db):
+        progress = await transition_quest_progress(db, user_id, quest_id, name, **changes)
+        return progress.status
+
+    return call
+
+
+@pytest.mark.asyncio
+async def test_parallel_transitions_apply_once(throwaway_schema):
+    database, user_id, quest_id = await make_database(throwaway_schema)
+
+    # Only one of many simultaneous submits passes the status check
+    results = await database.attempt_all(
+        [move(user_id, quest_id, "submit")] * PARALLEL
+    )
+    assert results.count(REVIEW_PENDING) == 1
+    assert results.count(400) == PARALLEL - 1
+
+    # A review is either completed or sent back, never both
+    moves = [
+        move(user_id, quest_id, "complete"),
+        move(user_id, quest_id, "request_changes", mentor_comment="Redo"),
+    ]
+    results = await database.attempt_all(moves * (PARALLEL // 2))
+    assert results.count(400) == PARALLEL - 1
+
+    async with database.session_factory() as db:
+        with pytest.raises(HTTPException) as missing:
+            await transition_quest_progress(db, user_id, uuid.uuid4(), "submit")
+    assert missing.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_bulk_review_skips_rows_not_pending(throwaway_schema):
+    database, user_id, quest_id = await make_database(throwaway_schema)
+
+    async with database.session_factory() as db:
+        progress_id = await db.scalar(select(UserQuestProgress.id))
+        missing_id = uuid.uuid4()
+
+        # Not submitted yet: nothing to review
+        assert await review_quest_progress(db, [(progress_id, "complete", None)]) == {}
+
+        await transition_quest_progress(db, user_id, quest_id, "submit")
+        updated = await review_quest_progress(
+            db,
+            [
+                (progress_id, "complete", "Well done"),
+                (missing_id, "request_changes", "Redo"),
+            ],
+        )
+        assert list(updated) == [progress_id]
+        assert updated[progress_id].status == TASK_COMPLETED
+        assert updated[progress_id].mentor_comment == "Well done"
+
+        # Already reviewed: skipped, not sent back
+        assert (
+            await review_quest_progress(db, [(progress_id, "request_changes", "x")])
+            == {}
+        )
+
+
+@pytest.mark.asyncio
+async def test_parallel_accepts_create_one_progress_row(throwaway_schema):
+    database, user_id, _ = await make_database(throwaway_schema)
+    quest_id = await database.add_quest("New")
+
+    def accept(quest_id):
+        async def call(db):
+            return (await start_quest(db, user_id, quest_id)).status
+
+        return call
+
+    results = await database.attempt_all([accept(quest_id)] * PARALLEL)
+    assert results.count(IN_PROGRESS) == 1
+    assert results.count(400) == PARALLEL - 1
+
+    async with database.session_factory() as db:
+        rows = await db.scalar(
+            select(func.count()).where(
+                UserQuestProgress.user_id == user_id,
+                UserQuestProgress.quest_id == quest_id,
+            )
+        )
+    assert rows == 1
+
+    assert await database.attempt(accept(uuid.uuid4())) == 404
@@ -0,0 +1,103 @@
+import random
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from app.rank_index import RankIndex
+
+
+def leaderboard_order(points_by_user):
+    # Same ordering as the SQL leaderboard: points desc, id desc
+    return sorted(
+        points_by_user.items(), key=lambda item: (item[1], item[0].int), reverse=True
+    )
+
+
+def test_rank_index_matches_sorted_leaderboard():
+    rng = random.Random(42)
+    user_ids = [uuid.UUID(int=rng.getrandbits(128)) for _ in range(300)]
+    # Ids sharing their high 64 bits exercise the full-id tie break
+    user_ids += [
+        uuid.UUID(int=(user_ids[0].int >> 64 << 64) | rng.getrandbits(64))
+        for _ in range(5)
+    ]
+
+    index = RankIndex(block_size=4)  # Small blocks force splits and block removals
+    index.load_sorted([])
+    expected = {}
+
+    for step in range(3000):
+        user_id = rng.choice(user_ids)
+        if rng.random() < 0.15:
+            index.remove(user_id)
+            expected.pop(user_id, None)
+        else:
+            points = rng.randint(0, 20)
+            index.update(user_id, points)
+            expected[user_id] = points
+
+        if step % 100 == 0:
+            order = leaderboard_order(expected)
+            assert len(index) == len(order)
+            for position, (entry_id, _) in enumerate(order, start=1):
+                assert index.position(entry_id) == position
+            assert [(u, p) for u, p, _ in index.top(7)] == order[:7]
+
+    order = leaderboard_order(expected)
+    middle = len(order) // 2
+    window = index.around(order[middle][0], 3)
+    assert [(u, p) for u, p, _ in window] == order[middle - 3 : middle + 4]
+    assert [position for _, _, position in window] == list(
+        range(middle - 2, middle + 5)
+    )
+    assert [(u, p) for u, p, _ in index.around(order[0][0], 2)] == order[:3]
+
+
+class StreamingSession:
+    """
+    Stand-in for the session used by `RankIndex.load`: streams the given
+    (id, points) rows and calls `during_stream` after the first one.
+    """
+
+    def __init__(self, rows, during_stream):
+        self.rows = rows
+        self.during_stream = during_stream
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def stream(self, statement):
+        return self._rows()
+
+    async def _rows(self):
+        for position, (user_id, points) in enumerate(self.rows):
+            yield SimpleNamespace(id=user_id, points=points)
+            if position == 0:
+                self.during_stream()
+
+
+@pytest.mark.asyncio
+async def test_updates_during_reload_are_replayed():
+    first, second = uuid.uuid4(), uuid.uuid4()
+    index = RankIndex()
+    index.load_sorted([(first, 10), (second, 5)])
+
+    # The reload reads the users before the update was committed, so it streams
+    # the old points; the update arriving meanwhile must survive the swap
+    rows = [(first, 10), (second, 5)]
+    await index.load(lambda: StreamingSession(rows, lambda: index.update(second, 50)))
+
+    assert index.position(second) == 1
+    assert index.points(second) == 50
+    assert index.position(first) == 2
+
+
+def test_unloaded_index_ignores_updates():
+    index = RankIndex()
+    index.update(uuid.uuid4(), 10)
+    assert len(index) == 0
+    assert not index.ready
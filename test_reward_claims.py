@@ -0,0 +1,71 @@
+import uuid
+
+import pytest
+from sqlalchemy import text
+
+from app.crud import complete_quest_and_take_rewards
+from app.quest_transitions import IN_PROGRESS, TASK_COMPLETED
+
+TEST_SCHEMA = "reward_claims_test"
+PARALLEL = 20
+
+
+async def add_rewards(database, quest_id):
+    """Two rewards worth 15 coins, 5 points and 1 level in total."""
+    async with database.engine.begin() as conn:
+        for coins, points, level in ((10, 3, 1), (5, 2, 0)):
+            await conn.execute(
+                text(
+                    "INSERT INTO rewards (id, description, quest_id, coins, points,"
+                    " level_increase) VALUES (:id, 'Reward', :quest_id, :coins,"
+                    " :points, :level)"
+                ),
+                {
+                    "id": uuid.uuid4(),
+                    "quest_id": quest_id,
+                    "coins": coins,
+                    "points": points,
+                    "level": level,
+                },
+            )
+
+
+@pytest.mark.asyncio
+async def test_parallel_claims_credit_once(throwaway_schema):
+    database = await throwaway_schema(TEST_SCHEMA, pool_size=PARALLEL)
+    user_id = await database.add_user(points=5, level=1, coins=100)
+    completed_id = await database.add_quest()
+    started_id = await database.add_quest()
+    await database.add_progress(user_id, completed_id, TASK_COMPLETED)
+    await database.add_progress(user_id, started_id, IN_PROGRESS)
+    await add_rewards(database, completed_id)
+    await add_rewards(database, started_id)
+
+    def claim(quest_id):
+        return lambda db: complete_quest_and_take_rewards(user_id, quest_id, db)
+
+    results = await database.attempt_all([claim(completed_id)] * PARALLEL)
+    claimed = [result for result in results if isinstance(result, dict)]
+    assert len(claimed) == 1
+    assert results.count(409) == PARALLEL - 1
+    assert (claimed[0]["reward"], claimed[0]["points"], claimed[0]["level"]) == (
+        15,
+        5,
+        1,
+    )
+
+    async with database.engine.connect() as conn:
+        coins, points, level = (
+            await conn.execute(
+                text("SELECT coins, points, level FROM users WHERE id = :id"),
+                {"id": user_id},
+            )
+        ).one()
+        claims = await conn.scalar(text("SELECT count(*) FROM user_rewards"))
+        ledger = await conn.scalar(text("SELECT sum(delta) FROM points_ledger"))
+    assert (coins, points, level) == (115, 10, 2)
+    assert claims == 2
+    assert ledger == 5
+
+    assert await database.attempt(claim(started_id)) == 409
+    assert await database.attempt(claim(uuid.uuid4())) == 409